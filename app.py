@@ -1,47 +1,76 @@
 import os
-import time
+import click
 import logging
 from flask import Flask, jsonify, request, g
-from flask_migrate import Migrate
-from config import Config
+from config import config
 from models import db
+from request_logging import configure_logging, init_app as init_request_logging
+from question_pool import question_pool
+from generation_cache import generation_cache
+from search_index import question_search
+from middleware import token_cache
+from hashing import password_hasher
+from llm import llm_provider
+from jobs import job_runner
+from rate_limit import rate_limiter
+import db_pool
+import query_stats
+import metrics
+import logstats
+import score_stats
+import user_import
 
 # Import blueprints
 from routes.users import users_bp
 from routes.speaking_tests import speaking_tests_bp
 from routes.questions import questions_bp
 from routes.auth import auth_bp
+from routes.admin import admin_bp
 
-# Logging configuration
-LOG_DIR = "logs"
-LOG_FILE = os.path.join(LOG_DIR, "api.log")
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s [%(module)s] %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+def create_app(config_class=None, llm_client=None):
+    """
+    Build the app. The profile defaults to FLASK_CONFIG, so `flask`, `hypercorn "app:create_app()"`
+    and the test suite each create exactly the app they need; nothing is built at import.
+    """
+    if config_class is None:
+        config_class = config[os.getenv('FLASK_CONFIG') or 'default']
 
+    # Logging configuration: queue-backed, see request_logging.py (no-op after the first app)
+    configure_logging()
 
-def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     config_class.init_app(app)
 
     # Initialize extensions
     db.init_app(app)
-    migrate = Migrate(app, db)
+    # Flask-Migrate pulls in alembic (~0.5s) and only serves the `flask db` commands, so it is
+    # set up when the app is built by the flask CLI and skipped in server workers
+    if click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    question_pool.init_app(app)
+    generation_cache.init_app(app)
+    question_search.init_app(app)
+    token_cache.init_app(app)
+    password_hasher.init_app(app)
+    llm_provider.init_app(app, client=llm_client)  # llm_client overrides LLM_PROVIDER, e.g. in tests
+    job_runner.init_app(app)
+    rate_limiter.init_app(app)
+    db_pool.init_app(app, db)
+    query_stats.init_app(app, db)
+    metrics.init_app(app)
+    logstats.init_app(app)
+    score_stats.init_app(app)
+    user_import.init_app(app)
 
     # Register blueprints
     app.register_blueprint(users_bp, url_prefix='/api/users')
     app.register_blueprint(speaking_tests_bp, url_prefix='/api/speaking_tests')
     app.register_blueprint(questions_bp, url_prefix='/api/questions')
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
 
     # Error handlers
     @app.errorhandler(400)
@@ -56,60 +85,32 @@ def create_app(config_class=Config):
     def internal_error(error):
         return jsonify({'error': 'Internal Server Error'}), 500
 
-    return app
-
-app = create_app()
-
-# -- Request start time for response time calculation --
-@app.before_request
-def start_timer():
-    g._start_time = time.time()
-
-# -- Log every incoming request --
-@app.before_request
-def log_request():
-    user_id = getattr(g, "user_id", None)
-    method = request.method
-    path = request.path
-    remote_addr = request.remote_addr
-    logging.info(
-        f"REQUEST: {method} {path} | User: {user_id} | IP: {remote_addr} | Args: {dict(request.args)} | Body: {request.get_json(silent=True)}"
-    )
-
-# -- Log every response with status and timing --
-@app.after_request
-def log_response(response):
-    method = request.method
-    path = request.path
-    status = response.status_code
-    user_id = getattr(g, "user_id", None)
-    duration = None
-    if hasattr(g, "_start_time"):
-        duration = round(time.time() - g._start_time, 3)
-    logging.info(
-        f"RESPONSE: {method} {path} | Status: {status} | User: {user_id} | Duration: {duration}s"
-    )
-    return response
-
-# -- Log all unhandled exceptions globally --
-@app.errorhandler(Exception)
-def log_exception(e):
-    import traceback
-    method = request.method
-    path = request.path
-    user_id = getattr(g, "user_id", None)
-    logging.error(
-        f"EXCEPTION: {method} {path} | User: {user_id} | Error: {e} | Traceback: {traceback.format_exc()}"
-    )
-    return (
-        jsonify({"error": "Internal Server Error"}),
-        500,
-    )
+    # Log all unhandled exceptions globally
+    @app.errorhandler(Exception)
+    def log_exception(e):
+        import traceback
+        method = request.method
+        path = request.path
+        user_id = getattr(g, "user_id", None)
+        logging.error(
+            f"EXCEPTION: {method} {path} | User: {user_id} | Error: {e} | Traceback: {traceback.format_exc()}"
+        )
+        return (
+            jsonify({"error": "Internal Server Error"}),
+            500,
+        )
+
+    # Request/response logging
+    init_request_logging(app)
 
+    return app
 
 # Entry point for local development
 if __name__ == '__main__':
-    # Optionally override via environment
-    env_config = os.getenv('FLASK_CONFIG') or 'default'
+    # Config profile comes from FLASK_CONFIG (development/testing/production)
+    app = create_app()
     debug = os.getenv('FLASK_DEBUG', 'True').lower() in ('true', '1', 'yes')
+    # With the reloader, only the child process that serves requests runs job workers
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        job_runner.start()
     app.run(host='0.0.0.0', port=5000, debug=debug)
@@ -0,0 +1,227 @@
+"""
+ASGI entry point:  hypercorn asgi:app
+
+The read-heavy question and speaking-test endpoints are served natively on
+the worker's event loop through an async SQLAlchemy engine (aiomysql or
+aiosqlite), so hundreds of concurrent reads share one loop and one pool
+instead of one thread each. Every other route is handed to the Flask app
+through hypercorn's WSGI adapter (see always_start for bodyless responses)
+and behaves exactly as under `python app.py`.
+"""
+import re
+import json
+import time
+import logging
+from urllib.parse import parse_qs
+from hypercorn.middleware import AsyncioWSGIMiddleware
+from werkzeug.http import parse_etags, quote_etag
+from sqlalchemy import select, func
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from metrics import IN_FLIGHT, observe_request
+from app import create_app
+from models import GeneratedQuestion, SpeakingTest, LISTED_QUESTIONS
+from pagination import keyset_query, split_page
+from etag import version_stmt, etag_for
+from routes.questions import serialize_question
+from routes.speaking_tests import serialize_speaking_test
+
+# Sync driver -> asyncio driver for the same database
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def make_async_uri(uri):
+    url = make_url(uri)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        self.status = status
+        self.message = message
+
+
+class AsyncReadApp:
+    """Routes a few GET endpoints to native coroutines and everything else to Flask."""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = AsyncioWSGIMiddleware(always_start(flask_app))
+        uri = flask_app.config.get("ASYNC_DATABASE_URI") or make_async_uri(flask_app.config["SQLALCHEMY_DATABASE_URI"])
+        # Same pool sizing as the sync engine; the async engine brings its own asyncio-safe pool class
+        options = {k: v for k, v in flask_app.config["SQLALCHEMY_ENGINE_OPTIONS"].items() if k != "poolclass"}
+        self.engine = create_async_engine(uri, **options)
+        self.session = async_sessionmaker(self.engine, expire_on_commit=False)
+        # (path pattern, blueprint and Flask rule used as metric labels, handler, (model, where)
+        #  whose version stamp makes the route a conditional GET, as etag.conditional does)
+        listed = (GeneratedQuestion, (LISTED_QUESTIONS,))
+        self.routes = [
+            (re.compile(r"^/api/questions/get-questions-async$"),
+             ("questions", "/api/questions/get-questions-async"), self.get_questions, listed),
+            (re.compile(r"^/api/questions/get-question-pages$"),
+             ("questions", "/api/questions/get-question-pages"), self.get_question_pages, listed),
+            (re.compile(r"^/api/speaking_tests/testid/(\d+)$"),
+             ("speaking_tests", "/api/speaking_tests/testid/<int:test_id>"), self.get_speaking_test, None),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+
+        if scope["type"] == "http" and scope["method"] == "GET":
+            for pattern, labels, handler, versioned in self.routes:
+                match = pattern.match(scope["path"])
+                if match:
+                    return await self.dispatch(scope, send, labels, handler, versioned, *match.groups())
+
+        return await self.wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                # Generation job workers run from startup, so jobs left by a restart resume without traffic
+                self.flask_app.extensions["job_runner"].start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def dispatch(self, scope, send, labels, handler, versioned, *args):
+        start = time.time()
+        blueprint, rule = labels
+        IN_FLIGHT.labels(blueprint).inc()
+        args_dict = {k: v[0] for k, v in parse_qs(scope["query_string"].decode("latin-1"), keep_blank_values=True).items()}
+        etag = None
+        try:
+            if versioned is not None:
+                etag = await self.current_etag(*versioned)
+            if etag and parse_etags(header(scope, b"if-none-match")).contains_weak(etag):
+                # Unchanged since the client's copy: no list query, no serialization
+                status, payload = 304, None
+            else:
+                status, payload = await handler(args_dict, *args)
+        except HTTPError as e:
+            status, payload = e.status, {"error": e.message}
+        except Exception as e:
+            logging.error(f"EXCEPTION: GET {scope['path']} | User: None | Error: {e}")
+            status, payload = 500, {"error": "Internal Server Error"}
+
+        if status == 304:
+            body, headers = b"", []
+        else:
+            body = json.dumps(payload).encode("utf-8")
+            headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        if etag and status in (200, 304):
+            headers += [(b"etag", quote_etag(etag).encode()), (b"cache-control", b"no-cache")]
+        try:
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+        finally:
+            IN_FLIGHT.labels(blueprint).dec()
+        duration = time.time() - start
+        observe_request(blueprint, rule, "GET", status, duration)
+        logging.info(
+            "RESPONSE: %s %s | Status: %s | User: %s | Duration: %ss",
+            "GET", scope["path"], status, None, round(duration, 3)
+        )
+
+    async def current_etag(self, model, where=()):
+        async with self.session() as session:
+            return etag_for(model, (await session.execute(version_stmt(model, where))).one())
+
+    # GET /api/questions/get-questions-async
+    async def get_questions(self, args):
+        async with self.session() as session:
+            result = await session.execute(
+                select(GeneratedQuestion.id, GeneratedQuestion.topic, GeneratedQuestion.question, GeneratedQuestion.created_at)
+                .where(LISTED_QUESTIONS)
+                .order_by(GeneratedQuestion.created_at.desc())
+            )
+            return 200, {"questions": [serialize_question(q) for q in result]}
+
+    # GET /api/questions/get-question-pages (page/limit or after= cursor mode)
+    async def get_question_pages(self, args):
+        limit = max(int_arg(args, "limit", 10), 1)
+        columns = (select(GeneratedQuestion.id, GeneratedQuestion.topic, GeneratedQuestion.question, GeneratedQuestion.created_at)
+                   .where(LISTED_QUESTIONS))
+        count = select(func.count()).select_from(GeneratedQuestion).where(LISTED_QUESTIONS)
+
+        async with self.session() as session:
+            if "after" in args:
+                try:
+                    stmt = keyset_query(columns, GeneratedQuestion, args["after"], limit)
+                except ValueError:
+                    raise HTTPError(400, "Invalid 'after' cursor")
+                questions, next_cursor = split_page((await session.execute(stmt)).all(), limit)
+                payload = {"questions": [serialize_question(q) for q in questions], "next_cursor": next_cursor}
+                if bool_arg(args, "include_total", False):
+                    payload["total"] = (await session.execute(count)).scalar()
+                return 200, payload
+
+            page = int_arg(args, "page", 1)
+            result = await session.execute(
+                columns.order_by(GeneratedQuestion.created_at.desc()).offset((page - 1) * limit).limit(limit)
+            )
+            payload = {"questions": [serialize_question(q) for q in result], "page": page}
+            if bool_arg(args, "include_total", True):
+                total = (await session.execute(count)).scalar()
+                payload["total"] = total
+                payload["pages"] = (total + limit - 1) // limit
+            return 200, payload
+
+    # GET /api/speaking_tests/testid/<test_id>
+    async def get_speaking_test(self, args, test_id):
+        async with self.session() as session:
+            test = await session.get(SpeakingTest, int(test_id))
+            if not test:
+                raise HTTPError(404, "SpeakingTest not found")
+            return 200, serialize_speaking_test(test)
+
+
+def always_start(wsgi_app):
+    """
+    hypercorn's WSGI adapter only sends http.response.start with the first body chunk,
+    so responses without one (304, HEAD, empty 204) never start and the server raises.
+    Yield an empty chunk for those.
+    """
+    def app(environ, start_response):
+        body = wsgi_app(environ, start_response)
+        try:
+            empty = True
+            for chunk in body:
+                empty = False
+                yield chunk
+            if empty:
+                yield b""
+        finally:
+            if hasattr(body, "close"):
+                body.close()
+    return app
+
+
+def header(scope, name):
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def int_arg(args, name, default):
+    try:
+        return int(args.get(name, default))
+    except ValueError:
+        return default
+
+
+def bool_arg(args, name, default):
+    if name not in args:
+        return default
+    return args[name].lower() in ("true", "1", "yes")
+
+
+app = AsyncReadApp(create_app())
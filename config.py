@@ -1,15 +1,155 @@
 import os 
 from dotenv import load_dotenv
+from db_pool import InstrumentedQueuePool
 
 load_dotenv()
 
+
+def engine_options(uri, pool_size=5, max_overflow=10, pool_timeout=30, pool_recycle=3600, pool_pre_ping=True):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for a pooled server database. DB_POOL_* environment
+    variables override the profile defaults passed in. SQLite uses its own
+    pools that take none of these options, so it gets none.
+    """
+    if not uri or uri.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", pool_size)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", max_overflow)),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", pool_timeout)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", pool_recycle)),  # below MySQL wait_timeout
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", str(pool_pre_ping)).lower() in ("true", "1", "yes"),
+    }
+
+
 class Config:
 
     SQLALCHEMY_DATABASE_URI=os.getenv("DATABASE_URI")
+    SQLALCHEMY_ENGINE_OPTIONS=engine_options(SQLALCHEMY_DATABASE_URI)
+    # asgi.py read paths; derived from DATABASE_URI (pymysql -> aiomysql, sqlite -> aiosqlite) when unset
+    ASYNC_DATABASE_URI=os.getenv("ASYNC_DATABASE_URI")
     SQLALCHEMY_TRACK_MODIFICATIONS=False
 
+    # SQL instrumentation: statements slower than this (seconds) are logged with params redacted;
+    # strict mode turns a route going over its @query_budget into an error instead of a warning
+    SLOW_QUERY_THRESHOLD=float(os.getenv("SLOW_QUERY_THRESHOLD", 0.5))
+    QUERY_BUDGET_STRICT=os.getenv("QUERY_BUDGET_STRICT", "false").lower() in ("true", "1", "yes")
+
+    # Read once here rather than from the environment on every request
+    JWT_SECRET_KEY=os.getenv("JWT_SECRET_KEY")
+    TOKEN_CACHE_SIZE=int(os.getenv("TOKEN_CACHE_SIZE", 1024))  # verified tokens kept; 0 disables
+
+    # Password hashing: werkzeug method string (e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:600000"),
+    # process-pool size (0 = hash inline) and how many extra calls may wait before we answer 429
+    PASSWORD_HASH_METHOD=os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    HASH_WORKERS=int(os.getenv("HASH_WORKERS", os.cpu_count() or 1))
+    HASH_QUEUE_SIZE=int(os.getenv("HASH_QUEUE_SIZE", 16))
+
+    # Request logging: per-endpoint/blueprint sample rates ("questions=0.1,users.list_users=0.5"),
+    # max JSON body size logged, optional field allowlist and fields always masked
+    LOG_SAMPLE_RATES={
+        key.strip(): float(rate)
+        for key, rate in (item.split("=", 1) for item in os.getenv("LOG_SAMPLE_RATES", "").split(",") if "=" in item)
+    }
+    LOG_BODY_MAX_BYTES=int(os.getenv("LOG_BODY_MAX_BYTES", 2048))
+    LOG_BODY_FIELDS={f.strip() for f in os.getenv("LOG_BODY_FIELDS", "").split(",") if f.strip()}
+    LOG_REDACT_FIELDS={f.strip() for f in os.getenv("LOG_REDACT_FIELDS", "password").split(",") if f.strip()}
+
+    # Rate limiting: "scope=burst/seconds" token buckets where scope is a blueprint or endpoint,
+    # optionally "@role" ("auth=20/60,questions@admin=120/60"); clients are users, or IPs before login.
+    # Backend "memory" (per worker), "sqlite" (shared by workers on one host) or "none"
+    RATE_LIMITS=os.getenv("RATE_LIMITS", "auth=20/60,auth.register=5/60,questions=30/60,questions@admin=120/60")
+    RATE_LIMIT_BACKEND=os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_PATH=os.getenv("RATE_LIMIT_PATH", "rate_limit.db")
+    RATE_LIMIT_MAX_KEYS=int(os.getenv("RATE_LIMIT_MAX_KEYS", 10000))
+    # LLM-bound requests (generate-question/-questions) in flight per process; 0 = unlimited
+    LLM_ROUTE_CONCURRENCY=int(os.getenv("LLM_ROUTE_CONCURRENCY", 8))
+
+    # Rows fetched per server-side batch by /api/questions/export
+    EXPORT_BATCH_SIZE=int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+    # Most tests accepted by one POST /api/speaking_tests/bulk-create
+    BULK_CREATE_MAX_ITEMS=int(os.getenv("BULK_CREATE_MAX_ITEMS", 1000))
+    # Bulk user import: rows per transaction and how many rejected rows the report lists
+    IMPORT_BATCH_SIZE=int(os.getenv("IMPORT_BATCH_SIZE", 1000))
+    IMPORT_MAX_ERRORS=int(os.getenv("IMPORT_MAX_ERRORS", 100))
+
+    # LLM client for question generation: "azure" or "stub" (offline, see llm.StubChatClient)
+    LLM_PROVIDER=os.getenv("LLM_PROVIDER", "azure")
+    AZURE_OPENAI_API_KEY=os.getenv("AZURE_OPENAI_API_KEY")
+    AZURE_OPENAI_ENDPOINT=os.getenv("AZURE_OPENAI_ENDPOINT")
+    AZURE_OPENAI_API_VERSION=os.getenv("AZURE_OPENAI_API_VERSION", "2024-12-01-preview")
+    # Stub: mean latency (seconds), its distribution (fixed, uniform or lognormal) and spread,
+    # share of calls that fail, words per answer and RNG seed for repeatable runs
+    LLM_STUB_LATENCY=float(os.getenv("LLM_STUB_LATENCY", 0.5))
+    LLM_STUB_LATENCY_DIST=os.getenv("LLM_STUB_LATENCY_DIST", "lognormal")
+    LLM_STUB_LATENCY_SIGMA=float(os.getenv("LLM_STUB_LATENCY_SIGMA", 0.5))
+    LLM_STUB_ERROR_RATE=float(os.getenv("LLM_STUB_ERROR_RATE", 0.0))
+    LLM_STUB_TOKENS=int(os.getenv("LLM_STUB_TOKENS", 20))
+    LLM_STUB_SEED=int(os.environ["LLM_STUB_SEED"]) if os.getenv("LLM_STUB_SEED") else None
+
+    # Question generation: max parallel LLM calls per batch and per-call timeout (seconds)
+    LLM_MAX_CONCURRENCY=int(os.getenv("LLM_MAX_CONCURRENCY", 5))
+    LLM_TIMEOUT=float(os.getenv("LLM_TIMEOUT", 30))
+
+    # Generation jobs: background worker threads per process, attempts per topic (transient
+    # LLM errors are retried with exponential backoff from JOB_RETRY_BACKOFF seconds), how long
+    # a worker's claim on a job lasts without renewal, how often idle workers poll, and the
+    # most topics one job may queue
+    JOB_WORKERS=int(os.getenv("JOB_WORKERS", 2))
+    JOB_MAX_ATTEMPTS=int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+    JOB_RETRY_BACKOFF=float(os.getenv("JOB_RETRY_BACKOFF", 1.0))
+    JOB_LEASE_SECONDS=int(os.getenv("JOB_LEASE_SECONDS", 120))
+    JOB_POLL_INTERVAL=float(os.getenv("JOB_POLL_INTERVAL", 5))
+    JOB_MAX_TOPICS=int(os.getenv("JOB_MAX_TOPICS", 500))
+
+    # Question pool: comma-separated topics kept pre-generated, refilled between the watermarks.
+    # Every worker process checks the stock; a database lease lets only one of them refill a
+    # topic at a time, and expires after QUESTION_POOL_LEASE_SECONDS if that process dies
+    QUESTION_POOL_TOPICS=[t.strip() for t in os.getenv("QUESTION_POOL_TOPICS", "").split(",") if t.strip()]
+    QUESTION_POOL_LOW=int(os.getenv("QUESTION_POOL_LOW", 2))
+    QUESTION_POOL_HIGH=int(os.getenv("QUESTION_POOL_HIGH", 10))
+    QUESTION_POOL_INTERVAL=float(os.getenv("QUESTION_POOL_INTERVAL", 60))  # seconds between periodic checks
+    QUESTION_POOL_LEASE_SECONDS=int(os.getenv("QUESTION_POOL_LEASE_SECONDS", 300))
+
+    # Generated-question cache: "memory", "sqlite" (shared by workers on one host) or "none"
+    GENERATION_CACHE_BACKEND=os.getenv("GENERATION_CACHE_BACKEND", "memory")
+    GENERATION_CACHE_TTL=int(os.getenv("GENERATION_CACHE_TTL", 3600))
+    GENERATION_CACHE_MAX_ENTRIES=int(os.getenv("GENERATION_CACHE_MAX_ENTRIES", 1024))
+    GENERATION_CACHE_PATH=os.getenv("GENERATION_CACHE_PATH", "generation_cache.db")
+
     @staticmethod
     def init_app(app):
         # This hook can be used to initialize extensions or perform
         # any app-specific configuration at create_app time
-        pass
\ No newline at end of file
+        pass
+
+
+class DevelopmentConfig(Config):
+    # Small pool, no pre-ping: a local MySQL rarely drops connections
+    SQLALCHEMY_ENGINE_OPTIONS=engine_options(Config.SQLALCHEMY_DATABASE_URI, pool_size=2, max_overflow=5, pool_pre_ping=False)
+
+
+class TestingConfig(Config):
+    TESTING=True
+    SQLALCHEMY_DATABASE_URI=os.getenv("TEST_DATABASE_URI", "sqlite://")
+    SQLALCHEMY_ENGINE_OPTIONS=engine_options(SQLALCHEMY_DATABASE_URI, pool_size=2, max_overflow=0, pool_timeout=5)
+    HASH_WORKERS=0
+    PASSWORD_HASH_METHOD="pbkdf2:sha256:1000"  # fast hashes keep auth tests quick
+    QUERY_BUDGET_STRICT=True
+    LLM_PROVIDER=os.getenv("LLM_PROVIDER", "stub")  # never call Azure from tests
+    LLM_STUB_LATENCY=0.0
+    JOB_WORKERS=0  # no background threads on the shared in-memory connection; tests call job_runner.run_next()
+
+
+class ProductionConfig(Config):
+    # Size pool_size + max_overflow per worker so workers x total stays under max_connections
+    SQLALCHEMY_ENGINE_OPTIONS=engine_options(Config.SQLALCHEMY_DATABASE_URI, pool_size=10, max_overflow=20, pool_recycle=1800)
+
+
+config = {
+    'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
+    'default': Config
+}
@@ -0,0 +1,100 @@
+import time
+import bisect
+import threading
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (seconds) of the checkout wait-time histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PoolStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)  # last slot is +Inf
+
+    def observe_wait(self, seconds):
+        with self.lock:
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self.stats.lock:
+                self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.observe_wait(time.perf_counter() - start)
+
+
+def count_event(stats, field):
+    def listener(*args):
+        with stats.lock:
+            setattr(stats, field, getattr(stats, field) + 1)
+    return listener
+
+
+def instrument_engine(engine):
+    """Attach checkout/checkin/connect/invalidate counters to the engine's pool."""
+    pool = engine.pool
+    if not hasattr(pool, "stats"):
+        pool.stats = PoolStats()  # non-instrumented pools (SQLite) still get event counts
+    for name, field in (("checkout", "checkouts"), ("checkin", "checkins"),
+                        ("connect", "connects"), ("invalidate", "invalidations")):
+        event.listen(pool, name, count_event(pool.stats, field))
+    return pool
+
+
+def pool_snapshot(pool):
+    """Point-in-time view of the pool for sizing it against worker counts."""
+    stats = pool.stats
+    snapshot = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        snapshot.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+        })
+
+    with stats.lock:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(WAIT_BUCKETS + ("+Inf",), stats.wait_buckets):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        snapshot.update({
+            "checkouts": stats.checkouts,
+            "checkins": stats.checkins,
+            "connects": stats.connects,
+            "invalidations": stats.invalidations,
+            "timeouts": stats.timeouts,
+            "wait_seconds": {"count": stats.wait_count, "sum": round(stats.wait_sum, 6), "buckets": buckets},
+        })
+    return snapshot
+
+
+def init_app(app, db):
+    with app.app_context():
+        app.extensions["db_pool"] = instrument_engine(db.engine)
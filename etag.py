@@ -0,0 +1,72 @@
+import asyncio
+import hashlib
+import inspect
+from functools import wraps
+from flask import request, current_app
+from sqlalchemy import select, func
+from models import db
+
+# Rows in users and generated_questions are only ever inserted through the API, so the
+# newest id identifies a table's contents. A transaction can commit after one holding a
+# later id, though; counting the ids in the most recent window catches that late row
+# while keeping the stamp a bounded range on the primary key.
+RECENT_IDS = 1000
+
+
+def version_stmt(model, where=()):
+    """SELECT (max id, rows among the newest RECENT_IDS ids) for the rows of `model` matching `where`."""
+    latest = select(func.max(model.id)).where(*where).scalar_subquery()
+    return select(func.max(model.id), func.count(model.id)).where(model.id > latest - RECENT_IDS, *where)
+
+
+def etag_for(model, version):
+    """Strong ETag (unquoted) for a table version; the URL already pins page, limit and filters."""
+    raw = f"{model.__tablename__}:{version[0]}:{version[1]}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:20]
+
+
+def current_etag(model, where=()):
+    return etag_for(model, db.session.execute(version_stmt(model, where)).one())
+
+
+def not_modified(etag):
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def tag_response(response, etag, private):
+    response = current_app.make_response(response)
+    if response.status_code == 200:
+        response.set_etag(etag)
+        # Let clients and caches keep the body but revalidate every time
+        response.cache_control.no_cache = True
+        if private:
+            response.cache_control.private = True
+    return response
+
+
+def conditional(model, private=False, where=()):
+    """
+    Conditional GET for a view listing the rows of `model` matching `where`: answers 304
+    when If-None-Match holds their current ETag, before the view runs any query or
+    serializes anything, and tags 200 responses otherwise. Works on sync and async views.
+    """
+    def decorator(f):
+        if inspect.iscoroutinefunction(f):
+            @wraps(f)
+            async def async_wrapper(*args, **kwargs):
+                etag = await asyncio.to_thread(current_etag, model, where)
+                if request.if_none_match.contains_weak(etag):
+                    return not_modified(etag)
+                return tag_response(await f(*args, **kwargs), etag, private)
+            return async_wrapper
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            etag = current_etag(model, where)
+            if request.if_none_match.contains_weak(etag):
+                return not_modified(etag)
+            return tag_response(f(*args, **kwargs), etag, private)
+        return wrapper
+    return decorator
@@ -0,0 +1,87 @@
+import math
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from metrics import LLM_LATENCY
+
+logger = logging.getLogger(__name__)
+
+# Chat-completions parameters used for every generated question
+MODEL = "gpt-35-turbo"
+MAX_TOKENS = 200
+TEMPERATURE = 0.7
+SYSTEM_PROMPT = "You are an IELTS speaking examiner."
+
+
+def normalize_topic(topic):
+    """Canonical form of a topic so "Climate Change" and "climate  change " match."""
+    return " ".join(topic.split()).casefold()
+
+
+def build_messages(topic):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Generate a speaking test question about: {topic}. Respond with ONLY the question, no introduction or explanations."}
+    ]
+
+
+def generate_question_text(client, topic, timeout=None):
+    """Ask the chat-completions client for one question about `topic`."""
+    kwargs = {}
+    if timeout:
+        kwargs["timeout"] = timeout  # per-call timeout, honoured by the OpenAI client
+
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        response = client.chat.completions.create(
+            model=MODEL,
+            messages=build_messages(topic),
+            max_tokens=MAX_TOKENS,
+            temperature=TEMPERATURE,
+            **kwargs
+        )
+        outcome = "ok"
+    finally:
+        LLM_LATENCY.labels(outcome).observe(time.perf_counter() - start)
+    return response.choices[0].message.content
+
+
+def generate_many(client, topics, max_concurrency=5, timeout=None):
+    """
+    Generate one question per topic with a bounded thread-pool fan-out.
+
+    Each call gets `timeout` seconds; the whole batch is additionally capped at
+    the time the slowest wave of `max_concurrency` calls may take, so a client
+    that ignores its timeout cannot hold the request open indefinitely.
+    Returns `(generated, errors)` in the order the topics were given.
+    No database work happens here, so any object exposing
+    `chat.completions.create` can stand in for the Azure client.
+    """
+    if not topics:
+        return [], []
+
+    workers = max(1, min(max_concurrency, len(topics)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="question-gen")
+    try:
+        futures = [executor.submit(generate_question_text, client, topic, timeout) for topic in topics]
+        batch_timeout = timeout * math.ceil(len(topics) / workers) if timeout else None
+        wait(futures, timeout=batch_timeout)
+    finally:
+        # Don't block on calls that overran the batch deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    generated = []
+    errors = []
+    for topic, future in zip(topics, futures):
+        if future.cancelled() or not future.done():
+            errors.append({"topic": topic, "error": f"Timed out after {timeout}s"})
+            continue
+        exc = future.exception()
+        if exc is not None:
+            logger.warning(f"Question generation failed | topic={topic} | error={exc}")
+            errors.append({"topic": topic, "error": str(exc)})
+        else:
+            generated.append({"topic": topic, "question": future.result()})
+
+    return generated, errors
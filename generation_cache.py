@@ -0,0 +1,111 @@
+import json
+import time
+import hashlib
+from local_store import MemoryLRU, SQLiteStore
+from generation import normalize_topic, MODEL, TEMPERATURE, MAX_TOKENS
+
+
+class MemoryCacheBackend(MemoryLRU):
+    """Per-process LRU dict with expiry timestamps."""
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._store(key, (time.time() + ttl, value))
+
+
+class SQLiteCacheBackend(SQLiteStore):
+    """LRU cache in a local SQLite file so every worker process on the host shares it."""
+
+    table = "generation_cache"
+    schema = (
+        "CREATE TABLE IF NOT EXISTS generation_cache ("
+        "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_generation_cache_accessed ON generation_cache (accessed_at)",
+    )
+
+    def get(self, key):
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value FROM generation_cache WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE generation_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO generation_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl, now)
+            )
+            conn.execute("DELETE FROM generation_cache WHERE expires_at <= ?", (now,))
+            self.evict(conn, "accessed_at")
+
+
+class GenerationCache:
+    """
+    Caches generated questions by normalized topic and model parameters.
+
+    The backend is chosen by GENERATION_CACHE_BACKEND: "memory" (default),
+    "sqlite" (shared file at GENERATION_CACHE_PATH) or "none" to disable.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        kind = config["GENERATION_CACHE_BACKEND"]
+        self.ttl = config["GENERATION_CACHE_TTL"]
+        max_entries = config["GENERATION_CACHE_MAX_ENTRIES"]
+
+        if kind == "memory":
+            self.backend = MemoryCacheBackend(max_entries)
+        elif kind == "sqlite":
+            self.backend = SQLiteCacheBackend(config["GENERATION_CACHE_PATH"], max_entries)
+        elif kind == "none":
+            self.backend = None
+        else:
+            raise ValueError(f"Unknown GENERATION_CACHE_BACKEND: {kind}")
+        app.extensions["generation_cache"] = self
+
+    @staticmethod
+    def make_key(topic, model=MODEL, temperature=TEMPERATURE, max_tokens=MAX_TOKENS):
+        raw = json.dumps([normalize_topic(topic), model, temperature, max_tokens])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, topic):
+        if self.backend is None:
+            return None
+        value = self.backend.get(self.make_key(topic))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, topic, question):
+        if self.backend is not None:
+            self.backend.set(self.make_key(topic), question, self.ttl)
+
+
+generation_cache = GenerationCache()
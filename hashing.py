@@ -0,0 +1,110 @@
+import os
+import threading
+import multiprocessing
+from collections import deque
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashingBusy(Exception):
+    """Raised when every hashing slot is taken; callers answer 429."""
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification on a dedicated process pool.
+
+    At most HASH_WORKERS + HASH_QUEUE_SIZE operations may be running or queued;
+    beyond that calls fail fast with HashingBusy instead of piling up and
+    starving request threads. HASH_WORKERS=0 hashes inline on the caller's thread.
+    """
+
+    def __init__(self, app=None):
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._canonical_method = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config["PASSWORD_HASH_METHOD"]
+        self.workers = app.config["HASH_WORKERS"]
+        self._slots = threading.BoundedSemaphore(self.workers + app.config["HASH_QUEUE_SIZE"])
+        self._canonical_method = None
+        app.extensions["password_hasher"] = self
+
+    def _get_executor(self):
+        # Created on first use so importing the app or running CLI commands spawns nothing
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    if multiprocessing.current_process().daemon:
+                        # hypercorn workers are daemonic and may not fork; hashlib's scrypt/pbkdf2
+                        # release the GIL, so threads still hash in parallel
+                        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hasher")
+                    else:
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            if not self.workers:
+                return fn(*args)
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def hash_many(self, passwords, executor=None):
+        """
+        Hash a batch in parallel for bulk imports. On a private `executor` the whole batch is
+        mapped at once. On the shared pool each hash takes a slot like any other call, but
+        waits for one instead of failing, and at most HASH_WORKERS run at a time, so
+        HASH_QUEUE_SIZE slots stay free for logins and registrations.
+        """
+        hash_one = partial(generate_password_hash, method=self.method)
+        if executor is not None:
+            # A few chunks per worker keep process-pool pickling overhead low
+            chunksize = max(1, len(passwords) // ((os.cpu_count() or 1) * 4))
+            return list(executor.map(hash_one, passwords, chunksize=chunksize))
+
+        if not self.workers:
+            hashes = []
+            for password in passwords:
+                with self._slots:
+                    hashes.append(hash_one(password))
+            return hashes
+
+        executor = self._get_executor()
+        hashes, in_flight = [], deque()
+        for password in passwords:
+            if len(in_flight) >= self.workers:
+                hashes.append(in_flight.popleft().result())
+            self._slots.acquire()
+            try:
+                future = executor.submit(hash_one, password)
+            except BaseException:
+                self._slots.release()
+                raise
+            future.add_done_callback(lambda _: self._slots.release())
+            in_flight.append(future)
+        hashes.extend(future.result() for future in in_flight)
+        return hashes
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """True when `pwhash` was made with different parameters than PASSWORD_HASH_METHOD."""
+        if self._canonical_method is None:
+            # werkzeug expands defaults ("scrypt" -> "scrypt:32768:8:1"); learn the full prefix once
+            self._canonical_method = generate_password_hash("", self.method).split("$", 1)[0]
+        return pwhash.split("$", 1)[0] != self._canonical_method
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,262 @@
+import os
+import time
+import uuid
+import click
+import random
+import socket
+import logging
+import threading
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from sqlalchemy import select, update, func, case, or_, and_
+from flask import current_app
+from flask.cli import with_appcontext
+from models import db, utcnow, GeneratedQuestion, GenerationJob, GenerationJobItem
+from generation import generate_question_text
+
+logger = logging.getLogger(__name__)
+
+# Errors worth another attempt: timeouts, dropped connections, 429s and 5xx from the API.
+# Matched by class name (including base classes) so openai is only imported by the client.
+TRANSIENT_ERRORS = {
+    "TimeoutError", "ConnectionError", "APITimeoutError", "APIConnectionError",
+    "RateLimitError", "InternalServerError", "LLMStubError",
+}
+
+
+def is_transient(error):
+    return any(cls.__name__ in TRANSIENT_ERRORS for cls in type(error).__mro__)
+
+
+def generate_with_retry(client, topic, timeout, max_attempts, backoff):
+    """
+    generate_question_text with exponential backoff (backoff, 2x, 4x... plus jitter)
+    between attempts on transient errors. Returns (question, error, attempts).
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return generate_question_text(client, topic, timeout=timeout), None, attempt
+        except Exception as e:
+            if attempt == max_attempts or not is_transient(e):
+                return None, str(e), attempt
+            delay = backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+            logger.warning(f"GENERATION JOB: retrying | topic={topic} | attempt={attempt} | delay={delay:.2f}s | error={e}")
+            time.sleep(delay)
+
+
+class LeaseLost(Exception):
+    """Raised when a job's lease expired and another worker took it over."""
+
+
+class JobRunner:
+    """
+    Runs queued GenerationJobs on background threads.
+
+    Jobs and their per-topic items live in the database, so any worker process
+    can pick them up and nothing is lost on restart. A worker claims a job by
+    taking a lease (locked_until, locked_by) with a conditional UPDATE. Renewals,
+    progress counters and the final status are conditional UPDATEs on locked_by
+    too, so a worker whose lease expired stops instead of overwriting the new
+    owner's progress; the job is resumed from the items that are still pending.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._threads = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        self.app = app
+        self.workers = config["JOB_WORKERS"]
+        self.max_attempts = config["JOB_MAX_ATTEMPTS"]
+        self.backoff = config["JOB_RETRY_BACKOFF"]
+        self.lease = config["JOB_LEASE_SECONDS"]
+        self.poll_interval = config["JOB_POLL_INTERVAL"]
+        app.extensions["job_runner"] = self
+        app.cli.add_command(run_jobs_command)
+
+        if self.workers:
+            # Servers start the threads explicitly (asgi.py's lifespan startup, `python app.py`,
+            # `flask run-jobs`); under any other server the first request does. Building the
+            # app never does, so CLI commands, tests and scripts spawn nothing
+            app.before_request(self._ensure_workers)
+
+    def enqueue(self, topics, created_by=None):
+        """Store a job with one pending item per topic and wake a worker. Returns the job."""
+        job = GenerationJob(status="queued", total=len(topics), completed=0, failed=0, created_by=created_by)
+        job.items = [GenerationJobItem(position=i, topic=topic, status="pending", attempts=0) for i, topic in enumerate(topics)]
+        db.session.add(job)
+        db.session.commit()
+        self._wake.set()
+        return job
+
+    def start(self, workers=None):
+        """Start `workers` threads (default JOB_WORKERS) unless this process already runs them."""
+        workers = self.workers if workers is None else workers
+        if self._threads or not workers:
+            return self._threads
+        with self._lock:
+            if not self._threads:
+                self._threads = [
+                    threading.Thread(target=self._run, name=f"generation-job-{i}", daemon=True)
+                    for i in range(workers)
+                ]
+                for thread in self._threads:
+                    thread.start()
+        return self._threads
+
+    def _ensure_workers(self):
+        self.start()
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    ran = self.run_next()
+            except Exception as e:
+                logger.error(f"GENERATION JOB: worker error | error={e}")
+                ran = False
+            if not ran:
+                self._wake.wait(timeout=self.poll_interval)
+                self._wake.clear()
+
+    def claim(self):
+        """Lease the oldest queued job, or one whose lease expired. Returns (job id, owner) or None."""
+        now = utcnow()
+        owner = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        runnable = or_(
+            GenerationJob.status == "queued",
+            and_(GenerationJob.status == "running", GenerationJob.locked_until < now)
+        )
+        candidates = db.session.execute(
+            select(GenerationJob.id).where(runnable).order_by(GenerationJob.id).limit(5)
+        ).scalars().all()
+        for job_id in candidates:
+            # Another worker may lease the same job between SELECT and UPDATE
+            claimed = db.session.execute(
+                update(GenerationJob)
+                .where(GenerationJob.id == job_id, runnable)
+                .values(status="running", locked_by=owner, locked_until=now + timedelta(seconds=self.lease),
+                        started_at=func.coalesce(GenerationJob.started_at, now))
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                return job_id, owner
+        return None
+
+    def run_next(self):
+        claimed = self.claim()
+        if claimed is None:
+            return False
+        try:
+            self.run_job(*claimed)
+        except LeaseLost:
+            db.session.rollback()
+            logger.warning(f"GENERATION JOB: lease lost, stopping | job={claimed[0]} | owner={claimed[1]}")
+        return True
+
+    def update_owned(self, job_id, owner, **values):
+        """Apply `values` to the job if `owner` still holds its lease, else raise LeaseLost (uncommitted)."""
+        updated = db.session.execute(
+            update(GenerationJob)
+            .where(GenerationJob.id == job_id, GenerationJob.locked_by == owner)
+            .values(**values)
+        ).rowcount
+        if not updated:
+            raise LeaseLost(job_id)
+
+    def run_job(self, job_id, owner):
+        job = db.session.get(GenerationJob, job_id)
+        pending = [(item.id, item.topic) for item in job.items if item.status == "pending"]
+        logger.info(f"GENERATION JOB: started | job={job_id} | pending={len(pending)} | total={job.total}")
+
+        config = self.app.config
+        client = self.app.extensions["llm"].client
+        executor = ThreadPoolExecutor(max_workers=max(1, min(config["LLM_MAX_CONCURRENCY"], len(pending) or 1)),
+                                      thread_name_prefix=f"job-{job_id}")
+        try:
+            futures = {
+                executor.submit(generate_with_retry, client, topic, config["LLM_TIMEOUT"],
+                                self.max_attempts, self.backoff): (item_id, topic)
+                for item_id, topic in pending
+            }
+            while futures:
+                # Wake at least every third of the lease to renew it, even if no topic finished
+                done, _ = wait(futures, timeout=self.lease / 3, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.record(job_id, owner, *futures.pop(future), *future.result())
+                self.update_owned(job_id, owner, locked_until=utcnow() + timedelta(seconds=self.lease))
+                db.session.commit()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Status from the counters as stored, in the same statement that releases the lease
+        status = case((GenerationJob.failed == 0, "completed"), (GenerationJob.completed == 0, "failed"), else_="partial")
+        self.update_owned(job_id, owner, status=status, finished_at=utcnow(), locked_until=None, locked_by=None)
+        db.session.commit()
+        job = db.session.get(GenerationJob, job_id)
+        logger.info(f"GENERATION JOB: {job.status} | job={job_id} | completed={job.completed} | failed={job.failed}")
+
+    def record(self, job_id, owner, item_id, topic, question, error, attempts):
+        """
+        Store one topic's outcome. The question row, the item and the job's counter (an
+        in-database increment) commit together, and only while `owner` holds the lease.
+        """
+        item = db.session.get(GenerationJobItem, item_id)
+        item.attempts += attempts
+        if question is not None:
+            item.question = GeneratedQuestion(topic=topic, question=question)
+            item.status = "done"
+            counter = {"completed": GenerationJob.completed + 1}
+        else:
+            item.error = error
+            item.status = "failed"
+            counter = {"failed": GenerationJob.failed + 1}
+        db.session.flush()
+        self.update_owned(job_id, owner, locked_until=utcnow() + timedelta(seconds=self.lease), **counter)
+        db.session.commit()
+
+
+def serialize_job(job, include_items=True):
+    payload = {
+        "id": job.id,
+        "status": job.status,
+        "total": job.total,
+        "completed": job.completed,
+        "failed": job.failed,
+        "pending": job.total - job.completed - job.failed,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+    if include_items:
+        payload["items"] = [
+            {
+                "topic": item.topic,
+                "status": item.status,
+                "attempts": item.attempts,
+                "question_id": item.question_id,
+                "question": item.question.question if item.question else None,
+                "error": item.error,
+            }
+            for item in job.items
+        ]
+    return payload
+
+
+job_runner = JobRunner()
+
+
+@click.command("run-jobs")
+@click.option("--workers", type=int, help="Worker threads (default JOB_WORKERS, at least 1).")
+@with_appcontext
+def run_jobs_command(workers):
+    """Run generation job workers in the foreground, e.g. on a host whose web processes set JOB_WORKERS=0."""
+    runner = current_app.extensions["job_runner"]
+    threads = runner.start(workers or runner.workers or 1)
+    click.echo(f"Running {len(threads)} generation job worker(s); Ctrl+C to stop", err=True)
+    for thread in threads:
+        thread.join()
@@ -0,0 +1,141 @@
+import math
+import time
+import random
+import hashlib
+import threading
+from types import SimpleNamespace
+
+
+class LLMStubError(RuntimeError):
+    """Simulated upstream failure raised by StubChatClient at LLM_STUB_ERROR_RATE."""
+
+
+class StubChatClient:
+    """
+    Offline stand-in for the Azure OpenAI client's `chat.completions.create`.
+
+    Each call sleeps for a latency drawn from a fixed, uniform or lognormal
+    distribution with the configured mean, fails with LLMStubError at
+    `error_rate`, and returns a question of `tokens` words. The text depends
+    only on the prompt, and the latency/error draws on `seed`, so runs are
+    repeatable. A call whose latency exceeds its `timeout` sleeps for the
+    timeout and raises TimeoutError, as a timed-out request would.
+    """
+
+    VOCABULARY = ("describe", "explain", "why", "how", "people", "your", "country", "often",
+                  "important", "changed", "future", "example", "think", "usually", "experience")
+
+    def __init__(self, latency=0.5, distribution="lognormal", sigma=0.5, error_rate=0.0, tokens=20, seed=None):
+        if distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown LLM_STUB_LATENCY_DIST: {distribution}")
+        self.latency = latency
+        self.distribution = distribution
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.tokens = tokens
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=self)
+        self.calls = 0
+
+    def sample_latency(self):
+        with self._lock:
+            if self.distribution == "fixed" or self.latency <= 0:
+                return max(self.latency, 0.0)
+            if self.distribution == "uniform":
+                # sigma is the half-width as a fraction of the mean
+                return self._random.uniform(self.latency * (1 - self.sigma), self.latency * (1 + self.sigma))
+            # lognormal with the requested mean; sigma sets the tail
+            return self._random.lognormvariate(math.log(self.latency) - self.sigma ** 2 / 2, self.sigma)
+
+    def create(self, model, messages, max_tokens=None, temperature=None, timeout=None, **kwargs):
+        latency = self.sample_latency()
+        with self._lock:
+            self.calls += 1
+            failed = self._random.random() < self.error_rate
+
+        if timeout and latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"stub LLM call exceeded {timeout}s")
+        time.sleep(latency)
+        if failed:
+            raise LLMStubError("stub LLM: simulated upstream error")
+
+        prompt = " ".join(m["content"] for m in messages)
+        words = self.completion_words(prompt, min(self.tokens, max_tokens or self.tokens))
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(index=0, finish_reason="stop",
+                                     message=SimpleNamespace(role="assistant", content=" ".join(words).capitalize() + "?"))],
+            usage=SimpleNamespace(prompt_tokens=len(prompt.split()), completion_tokens=len(words),
+                                  total_tokens=len(prompt.split()) + len(words)),
+        )
+
+    def completion_words(self, prompt, count):
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        return [self.VOCABULARY[digest[i % len(digest)] % len(self.VOCABULARY)] for i in range(max(count, 1))]
+
+
+def make_azure_client(config):
+    from openai import AzureOpenAI
+
+    return AzureOpenAI(
+        api_key=config["AZURE_OPENAI_API_KEY"],
+        azure_endpoint=config["AZURE_OPENAI_ENDPOINT"],
+        api_version=config["AZURE_OPENAI_API_VERSION"]
+    )
+
+
+def make_stub_client(config):
+    return StubChatClient(
+        latency=config["LLM_STUB_LATENCY"],
+        distribution=config["LLM_STUB_LATENCY_DIST"],
+        sigma=config["LLM_STUB_LATENCY_SIGMA"],
+        error_rate=config["LLM_STUB_ERROR_RATE"],
+        tokens=config["LLM_STUB_TOKENS"],
+        seed=config["LLM_STUB_SEED"]
+    )
+
+
+# LLM_PROVIDER name -> factory taking app.config
+PROVIDERS = {
+    "azure": make_azure_client,
+    "stub": make_stub_client,
+}
+
+
+class LLMProvider:
+    """
+    Holds the chat-completions client used for question generation.
+
+    The client comes from the LLM_PROVIDER factory, or is passed in directly
+    (create_app(llm_client=...)); anything exposing `chat.completions.create`
+    works. Factory clients are built on first use, so workers and CLI commands
+    that never generate a question don't import openai or open HTTP pools.
+    """
+
+    def __init__(self, app=None):
+        self._client = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, client=None):
+        name = app.config["LLM_PROVIDER"]
+        if client is None and name not in PROVIDERS:
+            raise ValueError(f"Unknown LLM_PROVIDER: {name}")
+        self._factory = PROVIDERS.get(name)
+        self._config = app.config
+        self._client = client
+        app.extensions["llm"] = self
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory(self._config)
+        return self._client
+
+
+llm_provider = LLMProvider()
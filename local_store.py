@@ -0,0 +1,78 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+
+
+class MemoryLRU:
+    """
+    Per-process LRU dict for the "memory" backends. Subclasses read and write
+    `_data` under `_lock` and call `_store` to insert and evict.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _store(self, key, value):
+        # Caller holds _lock
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteStore:
+    """
+    A table in a local SQLite file for the "sqlite" backends, so every worker
+    process on the host shares it. Each thread keeps its own autocommit
+    connection in WAL mode; `transaction()` groups statements.
+    """
+
+    table = None
+    schema = ()  # CREATE statements run once on open
+
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self.transaction() as conn:
+            for statement in self.schema:
+                conn.execute(statement)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # a crash may lose the last writes, never corrupt
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """IMMEDIATE takes the write lock up front, making read-modify-write atomic across processes."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def evict(self, conn, order_by):
+        """Keep the max_entries rows with the highest `order_by` (a recency column)."""
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY {order_by} DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        self._connect().execute(f"DELETE FROM {self.table}")
@@ -0,0 +1,223 @@
+"""
+flask logstats: latency report from the RESPONSE lines in logs/api.log.
+
+Files are read in large chunks and scanned with one compiled regex, so a
+multi-GB log streams through in a single pass. Memory depends on the number
+of distinct endpoints and users, never on the number of lines: latencies go
+into fixed-precision log-scale histograms and only the N slowest requests
+are kept. Rotated siblings (api.log.1, api.log.2.gz, ...) are read oldest
+first with --rotated; .gz files are decompressed on the fly.
+"""
+import os
+import re
+import json
+import glob
+import gzip
+import math
+import heapq
+from collections import Counter, defaultdict
+import click
+from request_logging import LOG_FILE
+
+CHUNK_SIZE = 16 * 1024 * 1024
+
+# RESPONSE lines as written by request_logging.log_response (and asgi.py); Queries/DB are optional
+# because older lines predate them
+RESPONSE_LINE = re.compile(
+    rb"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),\d+ \w+ \[\w+\] RESPONSE: (\S+) (\S+) \| Status: (\d+) \| User: (\S+)"
+    rb" \| Duration: ([\d.]+)s(?: \| Queries: (\d+) \| DB: ([\d.]+)s)?",
+    re.M
+)
+ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class LatencyHistogram:
+    """Log-scale histogram: percentiles within RELATIVE_ERROR of the true value in constant space."""
+
+    RELATIVE_ERROR = 0.01
+    MIN_VALUE = 0.0005  # seconds; the log rounds to milliseconds, so anything below is "0"
+
+    def __init__(self):
+        self.gamma = math.log1p(2 * self.RELATIVE_ERROR)
+        self.buckets = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        index = math.ceil(math.log(value) / self.gamma) if value >= self.MIN_VALUE else None
+        self.buckets[index] += 1
+
+    def percentile(self, p):
+        if not self.count:
+            return None
+        rank = p / 100 * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets, key=lambda i: -math.inf if i is None else i):
+            seen += self.buckets[index]
+            if seen > rank:
+                if index is None:
+                    return 0.0
+                # midpoint of the bucket, capped at the largest value actually seen
+                return min(2 * math.exp(index * self.gamma) / (1 + math.exp(self.gamma)), self.max)
+        return self.max
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.statuses = Counter()
+        self.queries = 0
+        self.db_time = 0.0
+
+
+class LogStats:
+    def __init__(self, since=None, until=None, slowest=10):
+        self.since = since.encode() if since else None
+        self.until = until.encode() if until else None
+        self.slowest_n = slowest
+        self.endpoints = defaultdict(EndpointStats)
+        self.statuses = Counter()
+        self.users = Counter()
+        self.slowest = []  # min-heap of (duration, timestamp, method, path, status, user)
+        self.lines = 0
+        self.first = None
+        self.last = None
+
+    def feed(self, data):
+        """Account for every RESPONSE line in `data` (a bytes block of whole lines)."""
+        since, until = self.since, self.until
+        for match in RESPONSE_LINE.finditer(data):
+            timestamp = match.group(1)
+            # ISO timestamps compare correctly as bytes; prefixes ("2025-05-20") work as bounds
+            if since and timestamp[:len(since)] < since:
+                continue
+            if until and timestamp[:len(until)] > until:
+                continue
+            self.add(match, timestamp)
+
+    def add(self, match, timestamp):
+        method, path, status, user, duration, queries, db_time = (
+            g.decode() if g is not None else None for g in match.groups()[1:]
+        )
+        duration = float(duration)
+        endpoint = f"{method} {ID_SEGMENT.sub('/<id>', path)}"
+
+        stats = self.endpoints[endpoint]
+        stats.latency.add(duration)
+        stats.statuses[status] += 1
+        if queries is not None:
+            stats.queries += int(queries)
+            stats.db_time += float(db_time)
+        self.statuses[status] += 1
+        self.users[user] += 1
+        self.lines += 1
+        if self.first is None or timestamp < self.first:
+            self.first = timestamp
+        if self.last is None or timestamp > self.last:
+            self.last = timestamp
+
+        entry = (duration, timestamp.decode(), method, path, status, user)
+        if len(self.slowest) < self.slowest_n:
+            heapq.heappush(self.slowest, entry)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def read(self, path):
+        """Stream a (possibly gzipped) log file through feed() in CHUNK_SIZE blocks."""
+        opener = gzip.open if path.endswith(".gz") else open
+        tail = b""
+        with opener(path, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunk = tail + chunk
+                cut = chunk.rfind(b"\n") + 1
+                tail = chunk[cut:]
+                self.feed(chunk[:cut])
+        if tail:
+            self.feed(tail)
+
+    def report(self, top_users=10):
+        endpoints = []
+        for endpoint, stats in sorted(self.endpoints.items(), key=lambda item: -item[1].latency.count):
+            latency = stats.latency
+            endpoints.append({
+                "endpoint": endpoint,
+                "count": latency.count,
+                "mean": round(latency.total / latency.count, 4),
+                "p50": round(latency.percentile(50), 4),
+                "p95": round(latency.percentile(95), 4),
+                "p99": round(latency.percentile(99), 4),
+                "max": latency.max,
+                "statuses": dict(sorted(stats.statuses.items())),
+                "avg_queries": round(stats.queries / latency.count, 2) if stats.queries else None,
+            })
+        return {
+            "responses": self.lines,
+            "first": self.first.decode() if self.first else None,
+            "last": self.last.decode() if self.last else None,
+            "statuses": dict(sorted(self.statuses.items())),
+            "endpoints": endpoints,
+            "users": [{"user": user, "requests": count} for user, count in self.users.most_common(top_users)],
+            "slowest": [
+                {"duration": d, "time": t, "method": m, "path": p, "status": s, "user": u}
+                for d, t, m, p, s, u in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+
+def rotated_files(path):
+    """`path` plus its rotated siblings (path.1, path.2.gz, ...), oldest first."""
+    def generation(name):
+        suffix = name[len(path) + 1:].split(".")[0]
+        return int(suffix) if suffix.isdigit() else 0
+
+    siblings = [p for p in glob.glob(glob.escape(path) + ".*") if generation(p)]
+    return sorted(siblings, key=generation, reverse=True) + ([path] if os.path.exists(path) else [])
+
+
+def format_report(report):
+    lines = [
+        f"{report['responses']} responses from {report['first']} to {report['last']}",
+        "Status mix: " + ", ".join(f"{status}={count}" for status, count in report["statuses"].items()),
+        "",
+        f"{'endpoint':<50}{'count':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  statuses",
+    ]
+    for e in report["endpoints"]:
+        statuses = " ".join(f"{s}:{c}" for s, c in e["statuses"].items())
+        lines.append(f"{e['endpoint']:<50}{e['count']:>8}{e['p50']:>9.3f}{e['p95']:>9.3f}{e['p99']:>9.3f}{e['max']:>9.3f}  {statuses}")
+
+    lines += ["", "Requests per user:"]
+    lines += [f"  {u['user']:<10}{u['requests']:>8}" for u in report["users"]]
+    lines += ["", "Slowest requests:"]
+    lines += [f"  {s['duration']:>8.3f}s  {s['time']}  {s['method']} {s['path']}  {s['status']}  user={s['user']}"
+              for s in report["slowest"]]
+    return "\n".join(lines)
+
+
+@click.command("logstats")
+@click.argument("paths", nargs=-1)
+@click.option("--since", help="Only lines at or after this time, e.g. 2025-05-20 or '2025-05-20 12:30'.")
+@click.option("--until", help="Only lines at or before this time (same format; prefixes are inclusive).")
+@click.option("--rotated", is_flag=True, help="Also read rotated files next to each path (api.log.1, api.log.2.gz, ...).")
+@click.option("--slowest", default=10, show_default=True, help="How many of the slowest requests to list.")
+@click.option("--top-users", default=10, show_default=True, help="How many users to list by request count.")
+@click.option("--json", "as_json", is_flag=True, help="Print the report as JSON.")
+def logstats_command(paths, since, until, rotated, slowest, top_users, as_json):
+    """Per-endpoint latency percentiles, status mix, per-user counts and slowest requests from the API log."""
+    stats = LogStats(since=since, until=until, slowest=slowest)
+    for path in paths or (LOG_FILE,):
+        for name in rotated_files(path) if rotated else [path]:
+            stats.read(name)
+    report = stats.report(top_users=top_users)
+    click.echo(json.dumps(report, indent=2) if as_json else format_report(report))
+
+
+def init_app(app):
+    app.cli.add_command(logstats_command)
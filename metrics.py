@@ -0,0 +1,87 @@
+import os
+import time
+import atexit
+from flask import Response, request, g
+from sqlalchemy import event
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+
+# Set PROMETHEUS_MULTIPROC_DIR (an empty directory, wiped on deploy) before the workers start and
+# every process writes its samples to mmap'd files there; /metrics in any worker sums them all.
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# Upper bounds (seconds) of the latency histogram buckets
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled.",
+    ["blueprint", "route", "method", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time from request start to response.",
+    ["blueprint", "route", "method"], buckets=REQUEST_BUCKETS
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being handled.",
+    ["blueprint"], multiprocess_mode="livesum"
+)
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds", "Chat-completions call latency.",
+    ["outcome"], buckets=LLM_BUCKETS
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    "db_pool_connections_in_use", "Connections checked out of the SQLAlchemy pool.",
+    multiprocess_mode="livesum"
+)
+
+
+def observe_request(blueprint, route, method, status, duration):
+    REQUESTS.labels(blueprint, route, method, status).inc()
+    REQUEST_LATENCY.labels(blueprint, route, method).observe(duration)
+
+
+def render():
+    """Text exposition of every metric, summed across worker processes in multiprocess mode."""
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+
+def init_app(app):
+    """Record per-route request metrics and serve them at /metrics."""
+
+    @app.before_request
+    def start_metrics():
+        g._metrics_start = time.perf_counter()
+        g._metrics_blueprint = request.blueprint or ""
+        IN_FLIGHT.labels(g._metrics_blueprint).inc()
+
+    @app.after_request
+    def record_metrics(response):
+        if "_metrics_start" in g:
+            route = request.url_rule.rule if request.url_rule else "<unmatched>"
+            observe_request(g._metrics_blueprint, route, request.method, response.status_code,
+                            time.perf_counter() - g._metrics_start)
+        return response
+
+    @app.teardown_request
+    def end_metrics(error=None):
+        if "_metrics_blueprint" in g:
+            IN_FLIGHT.labels(g._metrics_blueprint).dec()
+
+    pool = app.extensions.get("db_pool")
+    if pool is not None:
+        event.listen(pool, "checkout", lambda *args: DB_CONNECTIONS_IN_USE.inc())
+        event.listen(pool, "checkin", lambda *args: DB_CONNECTIONS_IN_USE.dec())
+
+    app.add_url_rule("/metrics", "metrics", lambda: Response(render(), mimetype=CONTENT_TYPE_LATEST))
+
+
+if MULTIPROC_DIR:
+    # Drop this worker's live gauges (in-flight, pool) from the shared totals when it exits
+    atexit.register(multiprocess.mark_process_dead, os.getpid())
@@ -1,12 +1,66 @@
-import os
 import jwt
+import time
+import hashlib
 import logging
 from functools import wraps
-from flask import request, jsonify, g
+from flask import request, jsonify, g, current_app
+from rate_limit import rate_limiter, retry_after_header
+from local_store import MemoryLRU
 
 # Ensure logger is initialized elsewhere
 logger = logging.getLogger(__name__)
 
+class TokenCache(MemoryLRU):
+    """
+    Bounded LRU of verified JWT claims keyed by a SHA-256 digest of the token.
+    Entries are dropped once the token's `exp` passes, so an expired token is
+    always re-checked by jwt.decode and rejected as before.
+    """
+
+    def __init__(self, max_entries=1024):
+        super().__init__(max_entries)
+
+    def init_app(self, app):
+        self.max_entries = app.config["TOKEN_CACHE_SIZE"]
+        self.clear()
+        app.extensions["token_cache"] = self
+
+    @staticmethod
+    def _key(token):
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token):
+        key = self._key(token)
+        with self._lock:
+            claims = self._data.get(key)
+            if claims is None:
+                return None
+            if claims.get("exp", 0) <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return claims
+
+    def put(self, token, claims):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._store(self._key(token), claims)
+
+    def revoke(self, token):
+        """Drop one token, e.g. on logout or password change."""
+        with self._lock:
+            self._data.pop(self._key(token), None)
+
+    def revoke_user(self, user_id):
+        """Drop every cached token issued to `user_id`, e.g. after a role change."""
+        with self._lock:
+            for key in [k for k, claims in self._data.items() if claims.get("user_id") == user_id]:
+                del self._data[key]
+
+
+token_cache = TokenCache()
+
 #User authentication and routes protection
 def token_required(f):
     @wraps(f)
@@ -18,11 +72,15 @@ def token_required(f):
 
         token = auth_header.split(" ")[1]
         try:
-            decoded = jwt.decode(
-                token,
-                os.getenv("JWT_SECRET_KEY"),
-                algorithms=["HS256"]
-            )
+            # Skip signature verification for a token already verified and still unexpired
+            decoded = token_cache.get(token)
+            if decoded is None:
+                decoded = jwt.decode(
+                    token,
+                    current_app.config["JWT_SECRET_KEY"],
+                    algorithms=["HS256"]
+                )
+                token_cache.put(token, decoded)
             g.user_id = decoded["user_id"]
             g.user_role = decoded["role"]
 
@@ -47,3 +105,38 @@ def require_role(required_role):
             return f(*args, **kwargs)
         return wrapper
     return decorator
+
+def too_many_requests(message, retry_after):
+    response = jsonify({"error": message})
+    response.headers["Retry-After"] = retry_after_header(retry_after)
+    return response, 429
+
+#Rate limiting: token bucket per user (per IP before login), limits from RATE_LIMITS.
+#Put it below token_required so g.user_id and g.user_role are known.
+def rate_limit(scope=None):
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            scopes = (scope,) if scope else (request.endpoint, request.blueprint)
+            user_id = getattr(g, 'user_id', None)
+            client = f"user:{user_id}" if user_id is not None else f"ip:{request.remote_addr}"
+            retry_after = rate_limiter.check(scopes, client, getattr(g, 'user_role', None))
+            if retry_after:
+                logger.warning(f"RATE LIMITED: {request.method} {request.path} | Client: {client} | Retry-After: {retry_after:.1f}s")
+                return too_many_requests("Too many requests, please retry later", retry_after)
+            return f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+#Admission control: at most LLM_ROUTE_CONCURRENCY LLM-bound requests in flight per process
+def llm_admission(f):
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if not rate_limiter.acquire_llm_slot():
+            logger.warning(f"LLM ADMISSION REJECTED: {request.method} {request.path} | User: {getattr(g, 'user_id', None)}")
+            return too_many_requests("Too many generation requests in progress, please retry shortly", 1)
+        try:
+            return f(*args, **kwargs)
+        finally:
+            rate_limiter.release_llm_slot()
+    return wrapper
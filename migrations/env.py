@@ -51,6 +51,20 @@ def get_metadata():
     return target_db.metadata
 
 
+def include_object_for(dialect_name):
+    """
+    Skip model objects declared for another dialect with .ddl_if(dialect=...), e.g. the
+    MySQL-only FULLTEXT index on generated_questions, so autogenerate and `flask db check`
+    on SQLite do not report them as missing.
+    """
+    def include_object(object, name, type_, reflected, compare_to):
+        ddl_if = getattr(object, '_ddl_if', None)
+        if not reflected and ddl_if is not None and isinstance(ddl_if.dialect, str):
+            return ddl_if.dialect == dialect_name
+        return True
+    return include_object
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -95,6 +109,8 @@ def run_migrations_online():
         conf_args["process_revision_directives"] = process_revision_directives
 
     connectable = get_engine()
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object_for(connectable.dialect.name)
 
     with connectable.connect() as connection:
         context.configure(
@@ -0,0 +1,32 @@
+"""Add (created_at, id) indexes for keyset pagination
+
+Revision ID: 08713fcf6d73
+Revises: fa04dfd6a28a
+Create Date: 2026-10-17 10:52:40.117635
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '08713fcf6d73'
+down_revision = 'fa04dfd6a28a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('generated_questions', schema=None) as batch_op:
+        batch_op.create_index('ix_generated_questions_created_at_id', ['created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_created_at_id')
+
+    with op.batch_alter_table('generated_questions', schema=None) as batch_op:
+        batch_op.drop_index('ix_generated_questions_created_at_id')
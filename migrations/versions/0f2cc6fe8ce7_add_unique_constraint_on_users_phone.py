@@ -0,0 +1,28 @@
+"""Add unique constraint on users.phone
+
+Revision ID: 0f2cc6fe8ce7
+Revises: fa346e8dddb5
+Create Date: 2026-10-17 11:41:27.903184
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0f2cc6fe8ce7'
+down_revision = 'fa346e8dddb5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Registration relies on this (and the existing email constraint) to reject duplicates.
+    # Resolve any existing duplicate phone numbers before upgrading.
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_users_phone', ['phone'])
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_users_phone', type_='unique')
@@ -0,0 +1,27 @@
+"""Add locked_by (lease owner) to generation_jobs
+
+Revision ID: 3936b9d5c669
+Revises: a5067be30c66
+Create Date: 2026-10-17 14:02:41.318027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3936b9d5c669'
+down_revision = 'a5067be30c66'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Lease renewals and progress updates only apply while the worker still owns the job
+    with op.batch_alter_table('generation_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('locked_by', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('generation_jobs', schema=None) as batch_op:
+        batch_op.drop_column('locked_by')
@@ -0,0 +1,62 @@
+"""Add generation job tables
+
+Revision ID: a4f4958b9901
+Revises: 0f2cc6fe8ce7
+Create Date: 2026-10-17 12:05:12.417903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f4958b9901'
+down_revision = '0f2cc6fe8ce7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('generation_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('failed', sa.Integer(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('locked_until', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('generation_jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_generation_jobs_status_locked_until', ['status', 'locked_until'], unique=False)
+
+    op.create_table('generation_job_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('topic', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['generation_jobs.id'], ),
+    sa.ForeignKeyConstraint(['question_id'], ['generated_questions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('generation_job_items', schema=None) as batch_op:
+        batch_op.create_index('ix_generation_job_items_job_id_status', ['job_id', 'status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('generation_job_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_generation_job_items_job_id_status')
+
+    op.drop_table('generation_job_items')
+    with op.batch_alter_table('generation_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_generation_jobs_status_locked_until')
+
+    op.drop_table('generation_jobs')
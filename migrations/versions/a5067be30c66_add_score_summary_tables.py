@@ -0,0 +1,53 @@
+"""Add score summary tables
+
+Revision ID: a5067be30c66
+Revises: edbebf2df914
+Create Date: 2026-10-17 13:02:41.208315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5067be30c66'
+down_revision = 'edbebf2df914'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_score_summaries',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('test_count', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('mean_score', sa.Float(), nullable=False),
+    sa.Column('best_score', sa.Float(), nullable=False),
+    sa.Column('latest_score', sa.Float(), nullable=False),
+    sa.Column('latest_test_id', sa.Integer(), nullable=False),
+    sa.Column('latest_test_date', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    with op.batch_alter_table('user_score_summaries', schema=None) as batch_op:
+        batch_op.create_index('ix_user_score_summaries_best_score', ['best_score'], unique=False)
+        batch_op.create_index('ix_user_score_summaries_mean_score', ['mean_score'], unique=False)
+
+    score_band_counts = op.create_table('score_band_counts',
+    sa.Column('band', sa.Float(), autoincrement=False, nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('band')
+    )
+    # One row per half band so score writes only UPDATE the histogram
+    op.bulk_insert(score_band_counts, [{'band': i / 2, 'count': 0} for i in range(19)])
+    # Existing scores are folded in by `flask rebuild-score-stats`
+
+
+def downgrade():
+    op.drop_table('score_band_counts')
+    with op.batch_alter_table('user_score_summaries', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_score_summaries_mean_score')
+        batch_op.drop_index('ix_user_score_summaries_best_score')
+
+    op.drop_table('user_score_summaries')
@@ -0,0 +1,30 @@
+"""Add question_pool_leases
+
+Revision ID: c81f2d4e7a90
+Revises: 3936b9d5c669
+Create Date: 2026-10-17 16:20:12.604118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81f2d4e7a90'
+down_revision = '3936b9d5c669'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # One row per pooled topic, leased by the process refilling it
+    op.create_table('question_pool_leases',
+    sa.Column('topic', sa.String(length=255), nullable=False),
+    sa.Column('locked_until', sa.DateTime(), nullable=True),
+    sa.Column('locked_by', sa.String(length=64), nullable=True),
+    sa.PrimaryKeyConstraint('topic')
+    )
+
+
+def downgrade():
+    op.drop_table('question_pool_leases')
@@ -0,0 +1,29 @@
+"""Add (user_id, test_date) and (status, test_date) indexes on speaking_tests
+
+Revision ID: edbebf2df914
+Revises: a4f4958b9901
+Create Date: 2026-10-17 12:31:08.552194
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'edbebf2df914'
+down_revision = 'a4f4958b9901'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serve GET /api/speaking_tests/list filtered by user or status, ordered by test_date
+    with op.batch_alter_table('speaking_tests', schema=None) as batch_op:
+        batch_op.create_index('ix_speaking_tests_user_id_test_date', ['user_id', 'test_date'], unique=False)
+        batch_op.create_index('ix_speaking_tests_status_test_date', ['status', 'test_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('speaking_tests', schema=None) as batch_op:
+        batch_op.drop_index('ix_speaking_tests_status_test_date')
+        batch_op.drop_index('ix_speaking_tests_user_id_test_date')
@@ -0,0 +1,29 @@
+"""Add served flag to generated_questions for the question pool
+
+Revision ID: fa04dfd6a28a
+Revises: e937b605e213
+Create Date: 2026-10-17 10:30:12.418207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fa04dfd6a28a'
+down_revision = 'e937b605e213'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows were already returned to a client, so they start as served
+    with op.batch_alter_table('generated_questions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('served', sa.Boolean(), server_default=sa.true(), nullable=False))
+        batch_op.create_index('ix_generated_questions_topic_served', ['topic', 'served'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('generated_questions', schema=None) as batch_op:
+        batch_op.drop_index('ix_generated_questions_topic_served')
+        batch_op.drop_column('served')
@@ -0,0 +1,28 @@
+"""Add FULLTEXT index on generated_questions topic and question
+
+Revision ID: fa346e8dddb5
+Revises: 08713fcf6d73
+Create Date: 2026-10-17 11:14:05.552310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fa346e8dddb5'
+down_revision = '08713fcf6d73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # MySQL only; other backends use the in-process index in search_index.py
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('ft_generated_questions_topic_question', 'generated_questions', ['topic', 'question'],
+                        unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ft_generated_questions_topic_question', table_name='generated_questions')
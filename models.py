@@ -1,8 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 from datetime import datetime, timezone
 
 db = SQLAlchemy()
 
+def utcnow():
+    # DateTime columns are naive; store and compare UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 class User(db.Model):
     __tablename__ = 'users'
 
@@ -16,6 +21,11 @@ class User(db.Model):
 
     speaking_tests = db.relationship('SpeakingTest', backref='user', cascade='all, delete-orphan')
 
+    __table_args__ = (
+        db.UniqueConstraint('phone', name='uq_users_phone'),
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
+
 class SpeakingTest(db.Model):
     __tablename__ = 'speaking_tests'
 
@@ -26,10 +36,106 @@ class SpeakingTest(db.Model):
     score = db.Column(db.Float)
     created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc), nullable=False)
 
+    __table_args__ = (
+        db.Index('ix_speaking_tests_user_id_test_date', 'user_id', 'test_date'),
+        db.Index('ix_speaking_tests_status_test_date', 'status', 'test_date'),
+    )
+
 class GeneratedQuestion(db.Model):
     __tablename__ = 'generated_questions'
 
     id = db.Column(db.Integer, primary_key=True)
     topic = db.Column(db.String(255), nullable=False)
     question = db.Column(db.Text, nullable=False)
+    served = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())  # False while waiting in the question pool
     created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_generated_questions_topic_served', 'topic', 'served'),
+        db.Index('ix_generated_questions_created_at_id', 'created_at', 'id'),
+        db.Index('ft_generated_questions_topic_question', 'topic', 'question', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
+
+# Questions the read endpoints may list: pool stock stays private until question_pool hands it out
+LISTED_QUESTIONS = GeneratedQuestion.served.is_(True)
+
+class QuestionPoolLease(db.Model):
+    """Which process is refilling a pooled topic, so workers never top up the same topic twice."""
+    __tablename__ = 'question_pool_leases'
+
+    topic = db.Column(db.String(255), primary_key=True)
+    locked_until = db.Column(db.DateTime)  # expired or NULL = free to claim
+    locked_by = db.Column(db.String(64))
+
+class GenerationJob(db.Model):
+    __tablename__ = 'generation_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed, partial, failed
+    total = db.Column(db.Integer, nullable=False)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
+    locked_until = db.Column(db.DateTime)  # lease held by the worker running the job; expired = resumable
+    locked_by = db.Column(db.String(64))  # lease owner; renewals and progress updates require it
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    items = db.relationship('GenerationJobItem', backref='job', cascade='all, delete-orphan',
+                            order_by='GenerationJobItem.position')
+
+    __table_args__ = (
+        db.Index('ix_generation_jobs_status_locked_until', 'status', 'locked_until'),
+    )
+
+class GenerationJobItem(db.Model):
+    __tablename__ = 'generation_job_items'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('generation_jobs.id'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)
+    topic = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    question_id = db.Column(db.Integer, db.ForeignKey('generated_questions.id'))
+    error = db.Column(db.Text)
+
+    question = db.relationship('GeneratedQuestion')
+
+    __table_args__ = (
+        db.Index('ix_generation_job_items_job_id_status', 'job_id', 'status'),
+    )
+
+class UserScoreSummary(db.Model):
+    """Per-user score aggregates, kept current by score_stats.record_score."""
+    __tablename__ = 'user_score_summaries'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    test_count = db.Column(db.Integer, nullable=False, default=0)  # scored tests
+    score_sum = db.Column(db.Float, nullable=False, default=0)
+    mean_score = db.Column(db.Float, nullable=False)
+    best_score = db.Column(db.Float, nullable=False)
+    latest_score = db.Column(db.Float, nullable=False)  # score of the scored test with the latest (test_date, id)
+    latest_test_id = db.Column(db.Integer, nullable=False)
+    latest_test_date = db.Column(db.DateTime, nullable=False)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    user = db.relationship('User')
+
+    __table_args__ = (
+        db.Index('ix_user_score_summaries_best_score', 'best_score'),
+        db.Index('ix_user_score_summaries_mean_score', 'mean_score'),
+    )
+
+class ScoreBandCount(db.Model):
+    """Number of scored tests per band (0.0 to 9.0 in half bands)."""
+    __tablename__ = 'score_band_counts'
+
+    band = db.Column(db.Float, primary_key=True, autoincrement=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+@event.listens_for(ScoreBandCount.__table__, 'after_create')
+def seed_score_bands(table, connection, **kw):
+    # One row per band so score writes only UPDATE the histogram (the migration seeds them too)
+    connection.execute(table.insert(), [{'band': i / 2, 'count': 0} for i in range(19)])
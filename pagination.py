@@ -0,0 +1,60 @@
+import json
+import base64
+from datetime import datetime
+from sqlalchemy import or_, and_
+
+
+def encode_cursor(created_at, row_id):
+    """Opaque token pointing just past the row with this (created_at, id)."""
+    raw = json.dumps([created_at.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor; raises ValueError on anything malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_page(query, model, after, limit, key="created_at", descending=True):
+    """
+    Page of `query` ordered by (`key`, id), newest first by default, starting after
+    the `after` token ('' for the first page).
+
+    Seeks on (key, id) instead of OFFSET, so every page costs the same
+    regardless of depth. Returns `(items, next_cursor)`; next_cursor is None on
+    the last page.
+    """
+    items = keyset_query(query, model, after, limit, key, descending).all()
+    return split_page(items, limit, key)
+
+
+def keyset_query(query, model, after, limit, key="created_at", descending=True):
+    """Apply the keyset ordering and seek to a Query or Select (fetching one extra row)."""
+    column = getattr(model, key)
+    if descending:
+        query = query.order_by(column.desc(), model.id.desc())
+    else:
+        query = query.order_by(column.asc(), model.id.asc())
+    if after:
+        value, row_id = decode_cursor(after)
+        if descending:
+            seek = or_(column < value, and_(column == value, model.id < row_id))
+        else:
+            seek = or_(column > value, and_(column == value, model.id > row_id))
+        query = query.filter(seek)
+    return query.limit(limit + 1)
+
+
+def split_page(items, limit, key="created_at"):
+    """Trim the extra row fetched by keyset_query and turn it into `next_cursor`."""
+    # One extra row tells us whether another page exists without counting
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(getattr(items[-1], key), items[-1].id)
+    return items, next_cursor
@@ -0,0 +1,68 @@
+import time
+import logging
+from sqlalchemy import event
+from flask import g, request, current_app, has_request_context
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A route ran more SQL statements than its @query_budget allows (QUERY_BUDGET_STRICT)."""
+
+
+def query_budget(max_queries):
+    """Declare how many SQL statements a view may run per request."""
+    def decorator(f):
+        # functools.wraps copies __dict__, so the budget survives token_required/require_role
+        f.query_budget = max_queries
+        return f
+    return decorator
+
+
+def waive_query_budget():
+    """Exempt the current request from its budget, for deliberate per-row fallbacks after a failed batch."""
+    g._query_budget_waived = True
+
+
+def redact_params(parameters, executemany):
+    """Describe bound parameters without their values (emails, hashes, tokens...)."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets redacted>"
+    count = len(parameters) if parameters else 0
+    return f"<{count} params redacted>"
+
+
+def init_app(app, db):
+    """Count statements and DB time per request and log statements slower than SLOW_QUERY_THRESHOLD."""
+    with app.app_context():
+        engine = db.engine
+
+    threshold = app.config["SLOW_QUERY_THRESHOLD"]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        if has_request_context():
+            g._query_count = g.get("_query_count", 0) + 1
+            g._query_time = g.get("_query_time", 0.0) + elapsed
+        if elapsed >= threshold:
+            logger.warning(
+                "SLOW QUERY: %.3fs | %s | Params: %s",
+                elapsed, " ".join(statement.split()), redact_params(parameters, executemany)
+            )
+
+    @app.after_request
+    def check_query_budget(response):
+        view = current_app.view_functions.get(request.endpoint)
+        budget = getattr(view, "query_budget", None)
+        count = g.get("_query_count", 0)
+        if budget is not None and count > budget and not g.get("_query_budget_waived"):
+            message = f"QUERY BUDGET EXCEEDED: {request.method} {request.path} ran {count} queries (budget {budget})"
+            if current_app.config["QUERY_BUDGET_STRICT"]:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
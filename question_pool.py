@@ -0,0 +1,209 @@
+import os
+import uuid
+import socket
+import logging
+import threading
+from datetime import timedelta
+from sqlalchemy import select, update, func, or_
+from sqlalchemy.exc import IntegrityError
+from models import db, utcnow, GeneratedQuestion, QuestionPoolLease
+from generation import normalize_topic, generate_many
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionPool:
+    """
+    Keeps unserved GeneratedQuestion rows ready for popular topics.
+
+    A background thread tops each configured topic up to the high watermark
+    whenever its stock drops to the low watermark, so generate-question can
+    hand out a stored row instead of waiting on the LLM. Every worker process
+    runs the thread, so a topic is only refilled under a QuestionPoolLease row
+    (taken with a conditional UPDATE, like jobs.claim) and its stock is counted
+    again once the lease is held.
+    """
+
+    def __init__(self, app=None):
+        self.topics = {}
+        self.hits = 0
+        self.misses = 0
+        self._levels = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.low = app.config["QUESTION_POOL_LOW"]
+        self.high = app.config["QUESTION_POOL_HIGH"]
+        self.interval = app.config["QUESTION_POOL_INTERVAL"]
+        self.lease = app.config["QUESTION_POOL_LEASE_SECONDS"]
+        self.topics = {normalize_topic(t): t for t in app.config["QUESTION_POOL_TOPICS"]}
+        app.extensions["question_pool"] = self
+
+        if self.topics:
+            # Start on the first request so CLI commands (flask db ...) never spawn the worker
+            app.before_request(self._ensure_worker)
+
+    def take(self, topic):
+        """Return an unserved question for `topic` and mark it served, or None on a miss."""
+        pool_topic = self.topics.get(normalize_topic(topic))
+        if pool_topic is None:
+            return None
+
+        question = None
+        # Another worker may claim the same row between SELECT and UPDATE; retry a few times
+        for _ in range(3):
+            row = db.session.execute(
+                select(GeneratedQuestion.id, GeneratedQuestion.question)
+                .where(GeneratedQuestion.topic == pool_topic, GeneratedQuestion.served.is_(False))
+                .limit(1)
+            ).first()
+            if row is None:
+                break
+            claimed = db.session.execute(
+                update(GeneratedQuestion)
+                .where(GeneratedQuestion.id == row.id, GeneratedQuestion.served.is_(False))
+                .values(served=True)
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                question = row.question
+                break
+
+        with self._lock:
+            if question is None:
+                self.misses += 1
+                self._levels[pool_topic] = 0
+            else:
+                self.hits += 1
+                self._levels[pool_topic] = max(self._levels.get(pool_topic, 1) - 1, 0)
+            needs_refill = self._levels[pool_topic] <= self.low
+
+        if needs_refill:
+            self._wake.set()
+        return question
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "low_watermark": self.low,
+                "high_watermark": self.high,
+                "levels": {t: self._levels.get(t) for t in self.topics.values()}
+            }
+
+    def _ensure_worker(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="question-pool", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    self.refill()
+            except Exception as e:
+                logger.error(f"QUESTION POOL: refill failed | error={e}")
+            self._wake.wait(timeout=self.interval)
+            self._wake.clear()
+
+    def stock(self, topics):
+        """Unserved questions per topic (topics without any are missing from the dict)."""
+        return dict(db.session.execute(
+            select(GeneratedQuestion.topic, func.count())
+            .where(GeneratedQuestion.topic.in_(topics), GeneratedQuestion.served.is_(False))
+            .group_by(GeneratedQuestion.topic)
+        ).all())
+
+    def claim(self, topic, owner):
+        """Lease `topic` for refilling unless another process holds an unexpired lease on it."""
+        now = utcnow()
+        until = now + timedelta(seconds=self.lease)
+        claimed = db.session.execute(
+            update(QuestionPoolLease)
+            .where(QuestionPoolLease.topic == topic,
+                   or_(QuestionPoolLease.locked_until.is_(None), QuestionPoolLease.locked_until < now))
+            .values(locked_by=owner, locked_until=until)
+        ).rowcount
+        if not claimed and db.session.get(QuestionPoolLease, topic) is None:
+            # First refill of this topic: create its lease row already held
+            db.session.add(QuestionPoolLease(topic=topic, locked_by=owner, locked_until=until))
+            claimed = 1
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another process created the row first and holds it
+            db.session.rollback()
+            return False
+        return bool(claimed)
+
+    def release(self, topics, owner):
+        db.session.execute(
+            update(QuestionPoolLease)
+            .where(QuestionPoolLease.topic.in_(topics), QuestionPoolLease.locked_by == owner)
+            .values(locked_by=None, locked_until=None)
+        )
+        db.session.commit()
+
+    def refill(self):
+        """Top up every topic at or below the low watermark to the high watermark."""
+        counts = self.stock(self.topics.values())
+        with self._lock:
+            for topic in self.topics.values():
+                self._levels[topic] = counts.get(topic, 0)
+
+        low = [topic for topic in self.topics.values() if counts.get(topic, 0) <= self.low]
+        if not low:
+            return
+
+        owner = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        claimed = [topic for topic in low if self.claim(topic, owner)]
+        if not claimed:
+            return
+
+        try:
+            # Count again under the lease: another process may have refilled since the first count
+            counts = self.stock(claimed)
+            wanted = []
+            for topic in claimed:
+                level = counts.get(topic, 0)
+                with self._lock:
+                    self._levels[topic] = level
+                if level <= self.low:
+                    wanted.extend([topic] * (self.high - level))
+            if not wanted:
+                return
+
+            config = self.app.config
+            generated, errors = generate_many(
+                self.app.extensions["llm"].client,
+                wanted,
+                max_concurrency=config["LLM_MAX_CONCURRENCY"],
+                timeout=config["LLM_TIMEOUT"]
+            )
+            db.session.add_all([
+                GeneratedQuestion(topic=item["topic"], question=item["question"], served=False)
+                for item in generated
+            ])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            self.release(claimed, owner)
+
+        with self._lock:
+            for item in generated:
+                self._levels[item["topic"]] += 1
+        logger.info(f"QUESTION POOL: refilled {len(generated)} questions | failed={len(errors)}")
+
+
+question_pool = QuestionPool()
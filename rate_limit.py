@@ -0,0 +1,133 @@
+import math
+import time
+import threading
+from local_store import MemoryLRU, SQLiteStore
+
+
+def parse_limits(spec):
+    """
+    "auth=10/60,questions@admin=300/60" -> {"auth": (10, 60.0), "questions@admin": (300, 60.0)}:
+    scope (blueprint or endpoint, optionally @role) -> (burst size, seconds to refill it).
+    """
+    limits = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        scope, rule = item.split("=", 1)
+        count, _, period = rule.partition("/")
+        limits[scope.strip()] = (int(count), float(period or 1))
+    return limits
+
+
+class MemoryBucketStore(MemoryLRU):
+    """Token buckets in a per-process LRU dict; each worker enforces the limit on its own."""
+
+    def consume(self, key, capacity, rate, now=None):
+        """Take one token. Returns 0 if allowed, otherwise seconds until a token is available."""
+        now = time.time() if now is None else now
+        with self._lock:
+            tokens, updated = self._data.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._store(key, (tokens, now))
+        return 0 if allowed else (1 - tokens) / rate
+
+
+class SQLiteBucketStore(SQLiteStore):
+    """Token buckets in a local SQLite file so every worker process on the host shares them."""
+
+    table = "rate_limit_buckets"
+    schema = (
+        "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+        "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_updated ON rate_limit_buckets (updated_at)",
+    )
+
+    def consume(self, key, capacity, rate, now=None):
+        now = time.time() if now is None else now
+        with self.transaction(immediate=True) as conn:
+            row = conn.execute("SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                (key, tokens, now)
+            )
+            if row is None:
+                # New key: trim buckets idle long enough to have refilled, beyond max_entries
+                self.evict(conn, "updated_at")
+        return 0 if allowed else (1 - tokens) / rate
+
+
+class RateLimiter:
+    """
+    Token-bucket limits per client, looked up by scope.
+
+    RATE_LIMITS maps scopes to "burst/seconds"; for a request the most specific
+    of endpoint@role, endpoint, blueprint@role and blueprint applies, and routes
+    with no matching scope are not limited. The backend is chosen by
+    RATE_LIMIT_BACKEND: "memory", "sqlite" (shared file at RATE_LIMIT_PATH) or
+    "none" to disable.
+    """
+
+    def __init__(self, app=None):
+        self.store = None
+        self.limits = {}
+        self.rejected = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        kind = config["RATE_LIMIT_BACKEND"]
+        max_keys = config["RATE_LIMIT_MAX_KEYS"]
+        if kind == "memory":
+            self.store = MemoryBucketStore(max_keys)
+        elif kind == "sqlite":
+            self.store = SQLiteBucketStore(config["RATE_LIMIT_PATH"], max_keys)
+        elif kind == "none":
+            self.store = None
+        else:
+            raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {kind}")
+        self.limits = parse_limits(config["RATE_LIMITS"])
+        self._llm_slots = threading.BoundedSemaphore(config["LLM_ROUTE_CONCURRENCY"]) if config["LLM_ROUTE_CONCURRENCY"] else None
+        app.extensions["rate_limiter"] = self
+
+    def limit_for(self, scopes, role):
+        for scope in scopes:
+            for candidate in (f"{scope}@{role}", scope) if role else (scope,):
+                if candidate in self.limits:
+                    return candidate, self.limits[candidate]
+        return None, None
+
+    def check(self, scopes, client_key, role=None):
+        """Seconds the client must wait before retrying (0 = allowed)."""
+        if self.store is None:
+            return 0
+        scope, limit = self.limit_for(scopes, role)
+        if limit is None:
+            return 0
+        count, period = limit
+        retry_after = self.store.consume(f"{scope}|{client_key}", count, count / period)
+        if retry_after:
+            self.rejected += 1
+        return retry_after
+
+    def acquire_llm_slot(self):
+        return self._llm_slots is None or self._llm_slots.acquire(blocking=False)
+
+    def release_llm_slot(self):
+        if self._llm_slots is not None:
+            self._llm_slots.release()
+
+
+def retry_after_header(seconds):
+    return str(max(1, math.ceil(seconds)))
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,130 @@
+import os
+import time
+import queue
+import atexit
+import random
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from flask import request, g
+
+LOG_DIR = "logs"
+LOG_FILE = os.path.join(LOG_DIR, "api.log")
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(module)s] %(message)s"
+
+
+class LazyQueueHandler(QueueHandler):
+    """Enqueue records as-is; message formatting happens on the listener thread."""
+
+    def prepare(self, record):
+        return record
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler that leaves flushing to the listener instead of flushing every record."""
+
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class BatchingQueueListener(QueueListener):
+    """Flushes handlers only once the queue is drained, so a burst becomes one write."""
+
+    def handle(self, record):
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+def configure_logging(log_file=LOG_FILE, level=logging.INFO):
+    """
+    Route all logging through a queue so request threads only pay for an enqueue.
+    Disk and console writes happen on a single listener thread. Safe to call twice.
+    """
+    root = logging.getLogger()
+    if any(isinstance(h, LazyQueueHandler) for h in root.handlers):
+        return
+
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = BufferedFileHandler(log_file, encoding='utf-8')
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = BatchingQueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    root.addHandler(LazyQueueHandler(log_queue))
+    root.setLevel(level)
+    listener.start()
+    atexit.register(listener.stop)
+
+
+def init_app(app):
+    """Register the REQUEST/RESPONSE log hooks."""
+    config = app.config
+
+    def is_sampled():
+        rates = config["LOG_SAMPLE_RATES"]
+        if not rates:
+            return True
+        rate = rates.get(request.endpoint, rates.get(request.blueprint, 1.0))
+        return rate >= 1.0 or random.random() < rate
+
+    def body_for_log():
+        if not request.is_json:
+            return None
+        size = request.content_length
+        if size is None:
+            # Chunked upload: measure the body itself (cached, so the view reads the same bytes)
+            size = len(request.get_data(cache=True))
+        if size > config["LOG_BODY_MAX_BYTES"]:
+            return f"<{size} bytes omitted>"
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            return body
+        allowed = config["LOG_BODY_FIELDS"]
+        redacted = config["LOG_REDACT_FIELDS"]
+        return {
+            key: "***" if key in redacted else value
+            for key, value in body.items()
+            if not allowed or key in allowed
+        }
+
+    # -- Request start time for response time calculation --
+    @app.before_request
+    def start_timer():
+        g._start_time = time.time()
+
+    # -- Log every incoming request (subject to per-route sampling) --
+    @app.before_request
+    def log_request():
+        g._log_sampled = is_sampled()
+        if not g._log_sampled:
+            return
+        logging.info(
+            "REQUEST: %s %s | User: %s | IP: %s | Args: %s | Body: %s",
+            request.method, request.path, getattr(g, "user_id", None), request.remote_addr,
+            request.args.to_dict(), body_for_log()
+        )
+
+    # -- Log every sampled response (and all server errors) with status and timing --
+    @app.after_request
+    def log_response(response):
+        status = response.status_code
+        if not getattr(g, "_log_sampled", True) and status < 500:
+            return response
+        duration = None
+        if hasattr(g, "_start_time"):
+            duration = round(time.time() - g._start_time, 3)
+        logging.info(
+            "RESPONSE: %s %s | Status: %s | User: %s | Duration: %ss | Queries: %s | DB: %ss",
+            request.method, request.path, status, getattr(g, "user_id", None), duration,
+            g.get("_query_count", 0), round(g.get("_query_time", 0.0), 3)
+        )
+        return response
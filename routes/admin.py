@@ -0,0 +1,16 @@
+# routes/admin.py
+from flask import Blueprint, jsonify, current_app
+from middleware import token_required, require_role
+from db_pool import pool_snapshot
+
+admin_bp = Blueprint('admin', __name__)
+
+# --------------------------
+# GET /api/admin/db-pool - Database connection pool telemetry
+# --------------------------
+# This endpoint is protected and requires admin role
+@admin_bp.route('/db-pool', methods=['GET'])
+@token_required
+@require_role('admin')
+def get_db_pool():
+    return jsonify(pool_snapshot(current_app.extensions["db_pool"])), 200
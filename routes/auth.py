@@ -1,11 +1,12 @@
-import os 
+import re
 import jwt
 import logging
 from datetime import datetime, timedelta, timezone
 from models import db, User
-from flask import Blueprint, request, jsonify, g
-from middleware import token_required
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.exc import IntegrityError
+from flask import Blueprint, request, jsonify, g, current_app
+from middleware import token_required, rate_limit
+from hashing import password_hasher, HashingBusy
 
 
 auth_bp = Blueprint('auth', __name__)
@@ -14,6 +15,7 @@ auth_bp = Blueprint('auth', __name__)
 # POST /api/auth/register - user registration
 # --------------------------
 @auth_bp.route('/register', methods=['POST'])
+@rate_limit()
 def register():
     data = request.get_json()
     name = data.get('name')
@@ -31,36 +33,42 @@ def register():
     if role not in allowed_roles:
         return jsonify({"error": f"Invalid role. Allowed roles are: {', '.join(allowed_roles)}"}), 400
 
-    # Check for Email uniqueness
-    if User.query.filter_by(email=email).first():
-        logging.warning(f"Registration failed: Duplicate email | email={email}")
-        return jsonify({"error": "User with this email already exists"}), 409
-
-    # Check for Phone No. uniqueness
-    if User.query.filter_by(phone=phone).first():
-        logging.warning(f"Registration failed: Duplicate phone | phone={phone}")
-        return jsonify({"error": "User with this phone number already exists"}), 409
-
-    hashed_password = generate_password_hash(password)
+    try:
+        hashed_password = password_hasher.hash(password)
+    except HashingBusy:
+        return hashing_busy_response()
     new_user = User(name=name, email=email, phone=phone, password=hashed_password, role=role)
 
+    # Uniqueness is enforced by the email/phone unique indexes: one INSERT, no pre-check race
     db.session.add(new_user)
-    db.session.commit()
-
-    return jsonify({
-        "message": "User registered successfully",
-        "user": {
+    try:
+        db.session.flush()
+        # Read the fields before commit expires them, so no extra SELECT is needed
+        user_payload = {
             "id": new_user.id,
             "name": new_user.name,
             "email": new_user.email,
             "role": new_user.role
         }
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if duplicate_field(e) == "phone":
+            logging.warning(f"Registration failed: Duplicate phone | phone={phone}")
+            return jsonify({"error": "User with this phone number already exists"}), 409
+        logging.warning(f"Registration failed: Duplicate email | email={email}")
+        return jsonify({"error": "User with this email already exists"}), 409
+
+    return jsonify({
+        "message": "User registered successfully",
+        "user": user_payload
     }), 201
 
 # --------------------------
 # POST /api/auth/login - user login
 # --------------------------
 @auth_bp.route('/login', methods=['POST'])
+@rate_limit()
 def login():
     data = request.get_json()
     email = data.get('email')
@@ -72,10 +80,24 @@ def login():
 
     user = User.query.filter_by(email=email).first()
 
-    if not user or not check_password_hash(user.password, password):
+    try:
+        valid = user is not None and password_hasher.verify(user.password, password)
+    except HashingBusy:
+        logging.warning(f"LOGIN REJECTED: Hashing pool saturated | email={email} | IP={request.remote_addr}")
+        return hashing_busy_response()
+
+    if not valid:
         logging.warning(f"LOGIN FAILED: Invalid credentials | email={email} | IP={request.remote_addr}")
         return jsonify({"error": "Invalid email or password"}), 401
 
+    # Upgrade the stored hash when PASSWORD_HASH_METHOD has changed since it was made
+    if password_hasher.needs_rehash(user.password):
+        try:
+            user.password = password_hasher.hash(password)
+            db.session.commit()
+        except HashingBusy:
+            pass  # try again on a later login
+
     #If login is successful, generate JWT token
     logging.info(f"LOGIN SUCCESS: email={email} | user_id={user.id} | IP={request.remote_addr}")
     token = generate_jwt(user.id, user.role)
@@ -91,13 +113,26 @@ def login():
         }
     }), 200
 
+def duplicate_field(error):
+    """Which unique column ('email' or 'phone') an IntegrityError on users was raised for."""
+    message = str(error.orig)
+    # MySQL: "Duplicate entry 'x' for key 'users.uq_users_phone'"; SQLite: "UNIQUE constraint failed: users.phone"
+    match = re.search(r"for key '([^']+)'", message) or re.search(r"constraint failed: (.+)$", message)
+    target = match.group(1) if match else message
+    return "phone" if "phone" in target else "email"
+
+def hashing_busy_response():
+    response = jsonify({"error": "Server is busy, please retry shortly"})
+    response.headers["Retry-After"] = "1"
+    return response, 429
+
 def generate_jwt(user_id, role):
     payload = {
         "user_id": user_id,
         "role": role,
         "exp": datetime.now(timezone.utc) + timedelta(hours=1)  # Token expiration setting
     }
-    secret = os.getenv("JWT_SECRET_KEY")  #check in .env 
+    secret = current_app.config["JWT_SECRET_KEY"]  #check in .env 
     token = jwt.encode(payload, secret, algorithm="HS256")
     return token
 
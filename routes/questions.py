@@ -1,19 +1,15 @@
+import json
 import asyncio
-from flask import Blueprint, request, jsonify, current_app
-from models import db, GeneratedQuestion
-from openai import AzureOpenAI
-import httpx
-import os
-from dotenv import load_dotenv
-from middleware import token_required, require_role
-
-load_dotenv()
-
-client = AzureOpenAI(
-    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-    api_version="2024-12-01-preview"
-    )
+from flask import Blueprint, request, jsonify, current_app, g, Response, stream_with_context, url_for
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from models import db, GeneratedQuestion, GenerationJob, GenerationJobItem, LISTED_QUESTIONS
+from middleware import token_required, require_role, rate_limit, llm_admission
+from generation import generate_question_text, generate_many
+from pagination import keyset_page
+from query_stats import query_budget
+from etag import conditional
+from jobs import serialize_job
 
 
 questions_bp = Blueprint('questions', __name__)
@@ -22,6 +18,7 @@ questions_bp = Blueprint('questions', __name__)
 # GET /api/questions/ (sync)
 # --------------------------
 @questions_bp.route('/get-questions-sync', methods=['GET'])
+@conditional(GeneratedQuestion, where=(LISTED_QUESTIONS,))
 def get_mock_questions_sync():
     questions = fetch_questions_from_db()  # Direct call, no async
 
@@ -37,6 +34,7 @@ def get_mock_questions_sync():
 # GET /api/questions (async)
 # --------------------------
 @questions_bp.route('/get-questions-async', methods=['GET'])
+@conditional(GeneratedQuestion, where=(LISTED_QUESTIONS,))
 async def get_mock_questions():
     # Fetch questions using a blocking DB call safely in async route
     questions = await asyncio.to_thread(fetch_questions_from_db)
@@ -50,45 +48,129 @@ async def get_mock_questions():
 
 # Synchronous DB fetcher
 def fetch_questions_from_db():
-    return GeneratedQuestion.query.order_by(GeneratedQuestion.created_at.desc()).all()
+    return GeneratedQuestion.query.filter(LISTED_QUESTIONS).order_by(GeneratedQuestion.created_at.desc()).all()
+
+# --------------------------
+# GET /api/questions/export - Stream every question as NDJSON or a JSON array
+# --------------------------
+@questions_bp.route('/export', methods=['GET'])
+def export_questions():
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in ('ndjson', 'json'):
+        return jsonify({"error": "format must be 'ndjson' or 'json'"}), 400
+
+    rows = stream_questions_from_db(current_app.config["EXPORT_BATCH_SIZE"])
+    if fmt == 'ndjson':
+        body = (json.dumps(row) + "\n" for row in rows)
+        mimetype = 'application/x-ndjson'
+    else:
+        body = chunked_json_array(rows)
+        mimetype = 'application/json'
+    return Response(stream_with_context(body), mimetype=mimetype)
+
+# Same envelope as get-questions-sync, written one row at a time
+def chunked_json_array(rows):
+    yield '{"questions": ['
+    for i, row in enumerate(rows):
+        yield ("," if i else "") + json.dumps(row)
+    yield ']}'
+
+# Reads in server-side batches so memory stays flat however large the table is
+def stream_questions_from_db(batch_size):
+    result = db.session.execute(
+        select(GeneratedQuestion.id, GeneratedQuestion.topic, GeneratedQuestion.question, GeneratedQuestion.created_at)
+        .where(LISTED_QUESTIONS)
+        .order_by(GeneratedQuestion.created_at.desc())
+        .execution_options(yield_per=batch_size)
+    )
+    for row in result:
+        yield {"id": row.id, "topic": row.topic, "question": row.question, "created_at": row.created_at.isoformat()}
+
+# --------------------------
+# GET /api/questions/search?q=...&page=1&limit=10 - Ranked full-text search
+# --------------------------
+@questions_bp.route('/search', methods=['GET'])
+def search_questions():
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    limit = max(request.args.get('limit', 10, type=int), 1)
+
+    if not query:
+        return jsonify({"error": "Missing 'q' query parameter"}), 400
+
+    total, results = current_app.extensions["question_search"].search(query, page, limit)
+
+    return jsonify({
+        "results": [dict(serialize_question(q), score=round(score, 4)) for q, score in results],
+        "total": total,
+        "pages": (total + limit - 1) // limit,
+        "page": page
+    }), 200
 
 # --------------------------
 # GET /api/questions/ (with pagination)
 # --------------------------
 
 @questions_bp.route('/get-question-pages', methods=['GET'])
+@query_budget(3)
+@conditional(GeneratedQuestion, where=(LISTED_QUESTIONS,))
 async def get_questions_pages():
     # Read pagination params
     page = request.args.get('page', 1, type=int)
-    limit = request.args.get('limit', 10, type=int)
+    limit = max(request.args.get('limit', 10, type=int), 1)
+    include_total = request.args.get('include_total', 'true').lower() in ('true', '1', 'yes')
 
-    # Offload DB fetch to thread
-    questions, total = await asyncio.to_thread(fetch_question_pages_from_db, page, limit)
+    # Cursor mode: ?after=<token> (empty for the first page) seeks instead of using OFFSET
+    if 'after' in request.args:
+        include_total = request.args.get('include_total', 'false').lower() in ('true', '1', 'yes')
+        try:
+            questions, next_cursor, total = await asyncio.to_thread(
+                fetch_question_cursor_page_from_db, request.args['after'], limit, include_total
+            )
+        except ValueError:
+            return jsonify({"error": "Invalid 'after' cursor"}), 400
 
-    pages = (total + limit - 1) // limit  # ceil division for total pages
+        payload = {
+            "questions": [serialize_question(q) for q in questions],
+            "next_cursor": next_cursor
+        }
+        if include_total:
+            payload["total"] = total
+        return jsonify(payload), 200
 
-    return jsonify({
-        "questions": [
-            {
-                "id": q.id,
-                "topic": q.topic,
-                "question": q.question,
-                "created_at": q.created_at.isoformat()
-            }
-            for q in questions
-        ],
-        "total": total,
-        "pages": pages,
-        "page": page
-    }), 200
+    # Offload DB fetch to thread
+    questions, total = await asyncio.to_thread(fetch_question_pages_from_db, page, limit, include_total)
 
-def fetch_question_pages_from_db(page, limit):
+    payload = {
+        "questions": [serialize_question(q) for q in questions],
+        "page": page
+    }
+    if include_total:
+        payload["total"] = total
+        payload["pages"] = (total + limit - 1) // limit  # ceil division for total pages
+    return jsonify(payload), 200
+
+def serialize_question(q):
+    return {
+        "id": q.id,
+        "topic": q.topic,
+        "question": q.question,
+        "created_at": q.created_at.isoformat()
+    }
+
+def fetch_question_pages_from_db(page, limit, include_total=True):
     # Query ordered by most recent
-    query = GeneratedQuestion.query.order_by(GeneratedQuestion.created_at.desc())
-    total = query.count()
+    query = GeneratedQuestion.query.filter(LISTED_QUESTIONS).order_by(GeneratedQuestion.created_at.desc())
+    total = query.count() if include_total else None
     questions = query.offset((page - 1) * limit).limit(limit).all()
     return questions, total
 
+def fetch_question_cursor_page_from_db(after, limit, include_total=False):
+    query = GeneratedQuestion.query.filter(LISTED_QUESTIONS)
+    questions, next_cursor = keyset_page(query, GeneratedQuestion, after, limit)
+    total = query.count() if include_total else None
+    return questions, next_cursor, total
+
 
 # --------------------------
 # POST /api/generate-question - Generate a question
@@ -97,32 +179,41 @@ def fetch_question_pages_from_db(page, limit):
 @questions_bp.route('/generate-question', methods=['POST'])
 @token_required
 @require_role('admin')
+@rate_limit()
+@llm_admission
 def generate_question():
     data = request.get_json()
     topic = data.get("topic")
+    fresh = bool(data.get("fresh", False))  # true skips the pool and the cache and always asks the LLM
     
     if not topic:
         return jsonify({"error": "Missing 'topic' in request body"}), 400
 
+    # Serve a pre-generated question when the topic is pooled
+    pool = current_app.extensions.get("question_pool")
+    question = pool.take(topic) if pool and not fresh else None
+    if question is not None:
+        return jsonify({"question": question}), 200
+
+    # Same (normalized) topic and model parameters as a recent call
+    cache = current_app.extensions.get("generation_cache")
+    if cache and not fresh:
+        question = cache.get(topic)
+        if question is not None:
+            return jsonify({"question": question, "cached": True}), 200
+
     try:
-        response = client.chat.completions.create(
-            model="gpt-35-turbo",
-            messages=[
-                {"role": "system", "content": "You are an IELTS speaking examiner."},
-                {"role": "user", "content": f"Generate a speaking test question about: {topic}. Respond with ONLY the question, no introduction or explanations."}
-            ],
-            max_tokens=200,
-            temperature=0.7
-            #top_p=1.0
-        )
-
-        question = response.choices[0].message.content
+        client = current_app.extensions["llm"].client
+        question = generate_question_text(client, topic, timeout=current_app.config["LLM_TIMEOUT"])
 
         # Save to DB
         new_entry = GeneratedQuestion(topic=topic, question=question)
         db.session.add(new_entry)
         db.session.commit()
 
+        if cache:
+            cache.set(topic, question)
+
         return jsonify({"question": question}), 200
 
     except Exception as e:
@@ -135,6 +226,8 @@ def generate_question():
 @questions_bp.route('/generate-questions', methods=['POST'])
 @token_required
 @require_role('admin')
+@rate_limit()
+@llm_admission
 def generate_questions():
     data = request.get_json()
     topics = data.get("topics")  # Expecting a list of topics
@@ -142,35 +235,98 @@ def generate_questions():
     if not topics or not isinstance(topics, list) or not all(isinstance(t, str) for t in topics):
         return jsonify({"error": "Request body must include 'topics' as a list of strings"}), 400
 
-    generated = []
-    errors = []
+    # Fan out the LLM calls, then save every successful question in one transaction
+    generated, errors = generate_many(
+        current_app.extensions["llm"].client,
+        topics,
+        max_concurrency=current_app.config["LLM_MAX_CONCURRENCY"],
+        timeout=current_app.config["LLM_TIMEOUT"]
+    )
 
-    for topic in topics:
+    if generated:
         try:
-            response = client.chat.completions.create(
-                model="gpt-35-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an IELTS speaking examiner."},
-                    {"role": "user", "content": f"Generate a speaking test question about: {topic}. Respond with ONLY the question, no introduction or explanations."}
-                ],
-                max_tokens=200,
-                temperature=0.7
-            )
-
-            question = response.choices[0].message.content
-
-            # Save to DB
-            new_entry = GeneratedQuestion(topic=topic, question=question)
-            db.session.add(new_entry)
+            db.session.add_all([GeneratedQuestion(topic=item["topic"], question=item["question"]) for item in generated])
             db.session.commit()
-
-            generated.append({"topic": topic, "question": question})
-
         except Exception as e:
-            errors.append({"topic": topic, "error": str(e)})
+            db.session.rollback()
+            return jsonify({"error": "Failed to save generated questions", "details": str(e)}), 500
 
     response_payload = {"generated": generated}
     if errors:
         response_payload["errors"] = errors
 
     return jsonify(response_payload), 200 if not errors else 207  # 207: Multi-Status if partial failure
+
+
+# --------------------------
+# POST /api/questions/generate-questions/jobs - Queue a batch generation job
+# --------------------------
+# This endpoint is protected and requires admin role
+@questions_bp.route('/generate-questions/jobs', methods=['POST'])
+@token_required
+@require_role('admin')
+@rate_limit()
+def create_generation_job():
+    data = request.get_json(silent=True) or {}
+    topics = data.get("topics")
+
+    if not topics or not isinstance(topics, list) or not all(isinstance(t, str) and t.strip() for t in topics):
+        return jsonify({"error": "Request body must include 'topics' as a list of strings"}), 400
+    max_topics = current_app.config['JOB_MAX_TOPICS']
+    if len(topics) > max_topics:
+        return jsonify({"error": f"At most {max_topics} topics per job"}), 400
+    max_length = GenerationJobItem.topic.type.length
+    too_long = [i for i, topic in enumerate(topics) if len(topic) > max_length]
+    if too_long:
+        return jsonify({"error": f"Topics must be at most {max_length} characters", "indexes": too_long}), 400
+
+    # Returns immediately; a background worker generates the questions (see jobs.py)
+    job = current_app.extensions["job_runner"].enqueue(topics, created_by=g.user_id)
+    status_url = url_for('questions.get_generation_job', job_id=job.id)
+    return jsonify({"job_id": job.id, "status": job.status, "status_url": status_url}), 202, {"Location": status_url}
+
+# --------------------------
+# GET /api/questions/jobs/<job_id> - Job progress and per-topic results
+# --------------------------
+# This endpoint is protected and requires admin role
+@questions_bp.route('/jobs/<int:job_id>', methods=['GET'])
+@token_required
+@require_role('admin')
+@query_budget(3)
+def get_generation_job(job_id):
+    job = db.session.get(GenerationJob, job_id, options=[
+        selectinload(GenerationJob.items).joinedload(GenerationJobItem.question)
+    ])
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(serialize_job(job)), 200
+
+# --------------------------
+# GET /api/questions/jobs - Most recent jobs, newest first
+# --------------------------
+# This endpoint is protected and requires admin role
+@questions_bp.route('/jobs', methods=['GET'])
+@token_required
+@require_role('admin')
+@query_budget(1)
+def list_generation_jobs():
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    query = GenerationJob.query.order_by(GenerationJob.id.desc())
+    status = request.args.get('status')
+    if status:
+        query = query.filter(GenerationJob.status == status)
+    return jsonify({"jobs": [serialize_job(job, include_items=False) for job in query.limit(limit)]}), 200
+
+
+# --------------------------
+# GET /api/questions/pool-stats - Question pool hit/miss counters
+# --------------------------
+# This endpoint is protected and requires admin role
+@questions_bp.route('/pool-stats', methods=['GET'])
+@token_required
+@require_role('admin')
+def get_pool_stats():
+    pool = current_app.extensions.get("question_pool")
+    if not pool or not pool.topics:
+        return jsonify({"error": "Question pool is not configured"}), 404
+    return jsonify(pool.stats()), 200
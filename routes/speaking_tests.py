@@ -1,7 +1,13 @@
 # routes/speaking_tests.py
-from flask import Blueprint, request, jsonify
+import logging
+from flask import Blueprint, request, jsonify, g, current_app
 from datetime import datetime
-from models import db, SpeakingTest, User
+from sqlalchemy import select, insert
+from models import db, SpeakingTest, User, UserScoreSummary, ScoreBandCount
+from middleware import token_required, require_role
+from pagination import keyset_page
+from query_stats import query_budget, waive_query_budget
+from score_stats import valid_score, record_score, serialize_summary
 
 speaking_tests_bp = Blueprint('speaking_tests', __name__)
 
@@ -9,6 +15,7 @@ speaking_tests_bp = Blueprint('speaking_tests', __name__)
 #POST /create_speaking_test
 # --------------------------
 @speaking_tests_bp.route('/create', methods=['POST'])
+@query_budget(3)
 def create_speaking_test():
     data = request.get_json() or {}
     user_id = data.get('user_id')
@@ -31,28 +38,245 @@ def create_speaking_test():
     db.session.add(test)
     db.session.commit()
 
-    return jsonify({
-        'id': test.id,
-        'user_id': test.user_id,
-        'test_date': test.test_date.isoformat(),
-        'status': test.status,
-        'score': test.score,
-        'created_at': test.created_at.isoformat()
-    }), 201
+    return jsonify(serialize_speaking_test(test)), 201
+
+# --------------------------
+#POST /speaking_tests/bulk-create
+# --------------------------
+# Schedule a cohort in one request: {"tests": [{"user_id", "test_date", "status"}, ...]}
+@speaking_tests_bp.route('/bulk-create', methods=['POST'])
+@token_required
+@require_role('admin')
+@query_budget(2)
+def bulk_create_speaking_tests():
+    data = request.get_json(silent=True) or {}
+    items = data.get('tests')
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': "Request body must include 'tests' as a non-empty list"}), 400
+    max_items = current_app.config['BULK_CREATE_MAX_ITEMS']
+    if len(items) > max_items:
+        return jsonify({'error': f'At most {max_items} tests per request'}), 400
+
+    # Validate the shape and parse dates up front, then check every user_id with one IN query
+    results = [None] * len(items)
+    parsed = {}
+    for i, item in enumerate(items):
+        error = validate_bulk_item(item)
+        if error:
+            results[i] = {'index': i, 'error': error}
+            continue
+        try:
+            test_date = datetime.fromisoformat(item['test_date'])
+        except ValueError:
+            results[i] = {'index': i, 'error': 'test_date must be ISO format'}
+            continue
+        parsed[i] = {'user_id': item['user_id'], 'test_date': test_date, 'status': item['status']}
+
+    user_ids = {row['user_id'] for row in parsed.values()}
+    existing = set(db.session.execute(select(User.id).where(User.id.in_(user_ids))).scalars()) if user_ids else set()
+    for i, row in list(parsed.items()):
+        if row['user_id'] not in existing:
+            results[i] = {'index': i, 'error': 'User not found'}
+            del parsed[i]
+
+    if parsed:
+        # One executemany in one transaction. Ids are not returned: RETURNING with a guaranteed
+        # row order falls back to one INSERT per row on several drivers (and MySQL has none)
+        try:
+            db.session.execute(insert(SpeakingTest), list(parsed.values()))
+            db.session.commit()
+        except Exception as e:
+            # Something validation did not catch (e.g. a user deleted since the lookup): insert
+            # row by row so only the offending items fail
+            db.session.rollback()
+            logging.warning(f"BULK CREATE: batch insert failed, retrying per row | error={getattr(e, 'orig', e)}")
+            waive_query_budget()
+            for i, row in list(parsed.items()):
+                try:
+                    with db.session.begin_nested():
+                        db.session.execute(insert(SpeakingTest), [row])
+                except Exception as row_error:
+                    results[i] = {'index': i, 'error': 'Failed to create speaking test', 'details': str(getattr(row_error, 'orig', row_error))}
+                    del parsed[i]
+            db.session.commit()
+        for i, row in parsed.items():
+            results[i] = {'index': i, 'user_id': row['user_id'], 'test_date': row['test_date'].isoformat(),
+                          'status': row['status']}
+
+    failed = [r for r in results if 'error' in r]
+    payload = {'created': len(parsed), 'failed': len(failed), 'results': results}
+    if not parsed:
+        return jsonify(payload), 400
+    return jsonify(payload), 201 if not failed else 207  # 207: Multi-Status if partial failure
+
+def validate_bulk_item(item):
+    """Error message for a malformed bulk-create item, or None."""
+    if not isinstance(item, dict) or not all([item.get('user_id'), item.get('test_date'), item.get('status')]):
+        return 'user_id, test_date, and status are required'
+    if not isinstance(item['user_id'], int) or isinstance(item['user_id'], bool):
+        return 'user_id must be an integer'
+    if not isinstance(item['test_date'], str):
+        return 'test_date must be ISO format'
+    if not isinstance(item['status'], str) or len(item['status']) > SpeakingTest.status.type.length:
+        return f'status must be a string of at most {SpeakingTest.status.type.length} characters'
+    return None
 
 # --------------------------
 #GET /speaking_test/testid/<int:test_id>
 # --------------------------
 @speaking_tests_bp.route('/testid/<int:test_id>', methods=['GET'])
+@query_budget(1)
 def get_speaking_test(test_id):
     test = SpeakingTest.query.get(test_id)
     if not test:
         return jsonify({'error': 'SpeakingTest not found'}), 404
+    return jsonify(serialize_speaking_test(test)), 200
+
+# --------------------------
+#GET /speaking_tests/list?user_id=&status=&date_from=&date_to=&scored=&after=
+# --------------------------
+# Admins see every test; other users only their own
+@speaking_tests_bp.route('/list', methods=['GET'])
+@token_required
+@query_budget(1)
+def list_speaking_tests():
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    descending = request.args.get('order', 'asc').lower() == 'desc'
+
+    query = SpeakingTest.query
+    user_id = request.args.get('user_id', type=int)
+    if getattr(g, 'user_role', None) != 'admin':
+        user_id = g.user_id
+    if user_id is not None:
+        query = query.filter(SpeakingTest.user_id == user_id)
+    if request.args.get('status'):
+        query = query.filter(SpeakingTest.status == request.args['status'])
+
+    try:
+        if request.args.get('date_from'):
+            query = query.filter(SpeakingTest.test_date >= datetime.fromisoformat(request.args['date_from']))
+        if request.args.get('date_to'):
+            query = query.filter(SpeakingTest.test_date <= datetime.fromisoformat(request.args['date_to']))
+    except ValueError:
+        return jsonify({'error': 'date_from and date_to must be ISO format'}), 400
+
+    scored = request.args.get('scored')
+    if scored is not None:
+        scored = scored.lower() in ('true', '1', 'yes')
+        query = query.filter(SpeakingTest.score.isnot(None) if scored else SpeakingTest.score.is_(None))
+
+    # Cursor pagination on (test_date, id): served by the (user_id, test_date) / (status, test_date) indexes
+    try:
+        tests, next_cursor = keyset_page(query, SpeakingTest, request.args.get('after', ''), limit,
+                                         key='test_date', descending=descending)
+    except ValueError:
+        return jsonify({'error': "Invalid 'after' cursor"}), 400
+
     return jsonify({
+        'speaking_tests': [serialize_speaking_test(t) for t in tests],
+        'next_cursor': next_cursor
+    }), 200
+
+# --------------------------
+#PUT /speaking_tests/<int:test_id>/score
+# --------------------------
+# {"score": 7.5} sets the band score, {"score": null} clears it; the summaries are updated in the same transaction
+@speaking_tests_bp.route('/<int:test_id>/score', methods=['PUT'])
+@token_required
+@require_role('admin')
+@query_budget(9)
+def set_speaking_test_score(test_id):
+    data = request.get_json(silent=True) or {}
+    if 'score' not in data:
+        return jsonify({'error': 'score is required'}), 400
+    score = data['score']
+    if score is not None and not valid_score(score):
+        return jsonify({'error': 'score must be a band from 0 to 9 in steps of 0.5'}), 400
+
+    # Lock the test row: concurrent PUTs for one test must each see the score the other wrote,
+    # or both fold the same first score into the summaries
+    test = db.session.get(SpeakingTest, test_id, with_for_update=True)
+    if not test:
+        return jsonify({'error': 'SpeakingTest not found'}), 404
+
+    old_score = test.score
+    test.score = float(score) if score is not None else None
+    try:
+        record_score(test, old_score)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to save score', 'details': str(e)}), 500
+
+    return jsonify(serialize_speaking_test(test)), 200
+
+# --------------------------
+#GET /speaking_tests/stats/users/<int:user_id>
+# --------------------------
+# Count, mean, best and latest score, read from the maintained summary row
+@speaking_tests_bp.route('/stats/users/<int:user_id>', methods=['GET'])
+@token_required
+@query_budget(1)
+def get_user_score_stats(user_id):
+    if getattr(g, 'user_role', None) != 'admin' and g.user_id != user_id:
+        return jsonify({'error': 'Access denied. Admins may read any user, others only themselves'}), 403
+    summary = db.session.get(UserScoreSummary, user_id)
+    if not summary:
+        return jsonify({'error': 'No scored speaking tests for this user'}), 404
+    return jsonify(serialize_summary(summary)), 200
+
+# --------------------------
+#GET /speaking_tests/stats/bands
+# --------------------------
+# Histogram of every scored test by band (19 rows, whatever the table size)
+@speaking_tests_bp.route('/stats/bands', methods=['GET'])
+@token_required
+@query_budget(1)
+def get_band_distribution():
+    rows = ScoreBandCount.query.order_by(ScoreBandCount.band).all()
+    total = sum(row.count for row in rows)
+    return jsonify({
+        'bands': {f'{row.band:.1f}': row.count for row in rows},
+        'total': total,
+        'mean_score': round(sum(row.band * row.count for row in rows) / total, 2) if total else None
+    }), 200
+
+# --------------------------
+#GET /speaking_tests/leaderboard?by=best|mean&limit=10&min_tests=1
+# --------------------------
+# Top users from the summary table, walking the best_score / mean_score index
+@speaking_tests_bp.route('/leaderboard', methods=['GET'])
+@token_required
+@query_budget(1)
+def get_leaderboard():
+    by = request.args.get('by', 'best')
+    if by not in ('best', 'mean'):
+        return jsonify({'error': "by must be 'best' or 'mean'"}), 400
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    min_tests = max(request.args.get('min_tests', 1, type=int), 1)
+
+    column = UserScoreSummary.best_score if by == 'best' else UserScoreSummary.mean_score
+    rows = db.session.execute(
+        db.select(UserScoreSummary, User.name)
+        .join(User, User.id == UserScoreSummary.user_id)
+        .where(UserScoreSummary.test_count >= min_tests)
+        .order_by(column.desc(), UserScoreSummary.user_id)
+        .limit(limit)
+    ).all()
+    return jsonify({
+        'by': by,
+        'leaderboard': [
+            {'rank': rank, 'name': name, **serialize_summary(summary)}
+            for rank, (summary, name) in enumerate(rows, start=1)
+        ]
+    }), 200
+
+def serialize_speaking_test(test):
+    return {
         'id': test.id,
         'user_id': test.user_id,
         'test_date': test.test_date.isoformat(),
         'status': test.status,
         'score': test.score,
         'created_at': test.created_at.isoformat()
-    }), 200
+    }
@@ -1,8 +1,11 @@
 # routes/users.py
-from flask import Blueprint, request, jsonify
-import re
+from flask import Blueprint, request, jsonify, current_app
 from models import db, User
 from middleware import token_required,require_role
+from pagination import keyset_page
+from query_stats import query_budget
+from etag import conditional
+from user_import import UserImport, read_records, format_for, valid_email, valid_phone, FORMATS
 
 users_bp = Blueprint('users', __name__)
 
@@ -19,10 +22,9 @@ def create_user():
     # Basic validation
     if not all([name, email, phone]):
         return jsonify({'error': 'name, email, and phone are required'}), 400
-    email_pattern = r"[^@]+@[^@]+\.[^@]+"
-    if not re.match(email_pattern, email):
+    if not valid_email(email):
         return jsonify({'error': 'Invalid email format'}), 400
-    if not (7 <= len(phone) <= 20):
+    if not valid_phone(phone):
         return jsonify({'error': 'Phone number must be between 7 and 20 characters'}), 400
 
     user = User(name=name, email=email, phone=phone)
@@ -37,35 +39,79 @@ def create_user():
         'created_at': user.created_at.isoformat()
     }), 201
 
+# --------------------------
+# POST /api/users/import - Bulk-create users from a CSV or NDJSON body
+# --------------------------
+# The body is read as a stream (Content-Type text/csv or application/x-ndjson, or ?format=),
+# imported in chunked transactions, and answered with a summary of created and rejected rows
+@users_bp.route('/import', methods=['POST'])
+@token_required
+@require_role('admin')
+def import_users():
+    fmt = request.args.get('format') or format_for(request.mimetype)
+    if fmt not in FORMATS:
+        return jsonify({'error': "Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson"}), 400
+
+    importer = UserImport(
+        batch_size=current_app.config['IMPORT_BATCH_SIZE'],
+        max_errors=current_app.config['IMPORT_MAX_ERRORS']
+    )
+    try:
+        report = importer.run(read_records(request.stream, fmt))
+    except ValueError as e:
+        # Bad header, or undecodable bytes mid-file: chunks before it stay committed
+        return jsonify({'error': str(e), **importer.report}), 400
+    return jsonify(report), 200
+
 # --------------------------
 # GET /api/users/list - List all users
 # --------------------------
 # This endpoint is protected and requires admin role
 @users_bp.route('/list', methods=['GET'])
+@query_budget(3)
 @token_required
 @require_role('admin')
+@conditional(User, private=True)
 def list_users():
     page = request.args.get('page', 1, type=int)
-    limit = request.args.get('limit', 5, type=int)
-    pagination = User.query.paginate(page=page, per_page=limit, error_out=False)
+    limit = max(request.args.get('limit', 5, type=int), 1)
 
-    users = [
-        {
-            'id': u.id,
-            'name': u.name,
-            'email': u.email,
-            'phone': u.phone,
-            'created_at': u.created_at.isoformat()
+    # Cursor mode: ?after=<token> (empty for the first page), newest first, no COUNT(*) unless asked
+    if 'after' in request.args:
+        include_total = request.args.get('include_total', 'false').lower() in ('true', '1', 'yes')
+        try:
+            items, next_cursor = keyset_page(User.query, User, request.args['after'], limit)
+        except ValueError:
+            return jsonify({'error': "Invalid 'after' cursor"}), 400
+
+        payload = {
+            'users': [serialize_user(u) for u in items],
+            'next_cursor': next_cursor
         }
-        for u in pagination.items
-    ]
+        if include_total:
+            payload['total'] = User.query.count()
+        return jsonify(payload), 200
 
-    return jsonify({
-        'users': users,
-        'total': pagination.total,
-        'pages': pagination.pages,
+    include_total = request.args.get('include_total', 'true').lower() in ('true', '1', 'yes')
+    pagination = User.query.paginate(page=page, per_page=limit, error_out=False, count=include_total)
+
+    payload = {
+        'users': [serialize_user(u) for u in pagination.items],
         'page': pagination.page
-    }), 200
+    }
+    if include_total:
+        payload['total'] = pagination.total
+        payload['pages'] = pagination.pages
+    return jsonify(payload), 200
+
+def serialize_user(u):
+    return {
+        'id': u.id,
+        'name': u.name,
+        'email': u.email,
+        'phone': u.phone,
+        'created_at': u.created_at.isoformat()
+    }
 
 # --------------------------
 # GET /api/users/getuserid/<int:user_id> - Get user by ID
@@ -0,0 +1,175 @@
+import time
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import select, update, delete, insert, func
+from sqlalchemy.exc import IntegrityError
+from models import db, utcnow, SpeakingTest, UserScoreSummary, ScoreBandCount
+
+BANDS = [i / 2 for i in range(19)]  # 0.0, 0.5, ... 9.0
+
+
+def valid_score(score):
+    """IELTS band scores: 0 to 9 in steps of 0.5."""
+    return (isinstance(score, (int, float)) and not isinstance(score, bool)
+            and 0 <= score <= 9 and float(score * 2).is_integer())
+
+
+def band_for(score):
+    # Scores written before validation existed may fall between bands
+    return min(max(round(score * 2) / 2, 0.0), 9.0)
+
+
+def bump_band(score, delta):
+    band = band_for(score)
+    updated = db.session.execute(
+        update(ScoreBandCount).where(ScoreBandCount.band == band).values(count=ScoreBandCount.count + delta)
+    ).rowcount
+    if not updated:
+        # Every band is seeded when the table is created; recreate one deleted by hand
+        db.session.add(ScoreBandCount(band=band, count=delta))
+
+
+def record_score(test, old_score):
+    """
+    Fold a change of `test.score` (previously `old_score`) into the summaries, in the
+    caller's transaction.
+
+    A first score is applied incrementally to the user's row and the band histogram.
+    Changing or clearing a score can lower the best or latest score, so that user's row
+    is recomputed from their own tests (a range on the (user_id, test_date) index).
+    """
+    new_score = test.score
+    if new_score == old_score:
+        return
+    if old_score is not None:
+        bump_band(old_score, -1)
+    if new_score is not None:
+        bump_band(new_score, 1)
+
+    # The row lock serializes concurrent scoring for one user (SQLite serializes writers anyway)
+    summary = db.session.execute(locked_summary(test.user_id)).scalar_one_or_none()
+    if old_score is not None or new_score is None:
+        refresh_user(test.user_id, summary)
+        return
+
+    if summary is None:
+        # There is no row to lock yet, so two first scores for one user can both get here
+        try:
+            with db.session.begin_nested():
+                db.session.add(UserScoreSummary(
+                    user_id=test.user_id, test_count=1, score_sum=new_score, mean_score=new_score,
+                    best_score=new_score, latest_score=new_score, latest_test_id=test.id,
+                    latest_test_date=test.test_date, updated_at=utcnow()))
+            return
+        except IntegrityError:
+            # The other request inserted first: fold this score into its row. A locking read
+            # sees the committed row even where a plain SELECT would read an older snapshot
+            summary = db.session.execute(locked_summary(test.user_id)).scalar_one()
+    summary.test_count += 1
+    summary.score_sum += new_score
+    summary.mean_score = summary.score_sum / summary.test_count
+    summary.best_score = max(summary.best_score, new_score)
+    if (test.test_date, test.id) >= (summary.latest_test_date, summary.latest_test_id):
+        summary.latest_score = new_score
+        summary.latest_test_id = test.id
+        summary.latest_test_date = test.test_date
+    summary.updated_at = utcnow()
+
+
+def locked_summary(user_id):
+    return select(UserScoreSummary).where(UserScoreSummary.user_id == user_id).with_for_update()
+
+
+def refresh_user(user_id, summary=None):
+    """Recompute one user's summary from speaking_tests (deleting it if nothing is scored)."""
+    scored = [SpeakingTest.user_id == user_id, SpeakingTest.score.isnot(None)]
+    count, total, best = db.session.execute(
+        select(func.count(SpeakingTest.id), func.sum(SpeakingTest.score), func.max(SpeakingTest.score)).where(*scored)
+    ).one()
+    if not count:
+        if summary is not None:
+            db.session.delete(summary)
+        return
+    latest = db.session.execute(
+        select(SpeakingTest).where(*scored).order_by(SpeakingTest.test_date.desc(), SpeakingTest.id.desc()).limit(1)
+    ).scalar_one()
+    if summary is None:
+        summary = UserScoreSummary(user_id=user_id)
+        db.session.add(summary)
+    summary.test_count = count
+    summary.score_sum = total
+    summary.mean_score = total / count
+    summary.best_score = best
+    summary.latest_score = latest.score
+    summary.latest_test_id = latest.id
+    summary.latest_test_date = latest.test_date
+    summary.updated_at = utcnow()
+
+
+def rebuild(batch_size=1000):
+    """
+    Recompute every summary and the band histogram from speaking_tests in one transaction.
+
+    Scored tests are streamed once in (user_id, test_date, id) order, so the latest score
+    per user is simply the last one seen. Summaries are inserted after the scan because
+    some drivers cannot run statements on a connection with an open streaming cursor.
+    Returns (users, scored tests).
+    """
+    now = utcnow()
+    bands = dict.fromkeys(BANDS, 0)
+    summaries = {}
+    rows = db.session.execute(
+        select(SpeakingTest.user_id, SpeakingTest.id, SpeakingTest.test_date, SpeakingTest.score)
+        .where(SpeakingTest.score.isnot(None))
+        .order_by(SpeakingTest.user_id, SpeakingTest.test_date, SpeakingTest.id)
+        .execution_options(yield_per=batch_size)
+    )
+    scored = 0
+    for user_id, test_id, test_date, score in rows:
+        scored += 1
+        bands[band_for(score)] += 1
+        summary = summaries.get(user_id)
+        if summary is None:
+            summary = summaries[user_id] = {"user_id": user_id, "test_count": 0, "score_sum": 0.0,
+                                            "best_score": score, "updated_at": now}
+        summary["test_count"] += 1
+        summary["score_sum"] += score
+        summary["best_score"] = max(summary["best_score"], score)
+        summary.update(latest_score=score, latest_test_id=test_id, latest_test_date=test_date)
+
+    db.session.execute(delete(UserScoreSummary))
+    db.session.execute(delete(ScoreBandCount))
+    db.session.execute(insert(ScoreBandCount), [{"band": band, "count": count} for band, count in bands.items()])
+    values = list(summaries.values())
+    for summary in values:
+        summary["mean_score"] = summary["score_sum"] / summary["test_count"]
+    for start in range(0, len(values), batch_size):
+        db.session.execute(insert(UserScoreSummary), values[start:start + batch_size])
+    db.session.commit()
+    return len(values), scored
+
+
+def serialize_summary(summary):
+    return {
+        "user_id": summary.user_id,
+        "test_count": summary.test_count,
+        "mean_score": round(summary.mean_score, 2),
+        "best_score": summary.best_score,
+        "latest_score": summary.latest_score,
+        "latest_test_id": summary.latest_test_id,
+        "latest_test_date": summary.latest_test_date.isoformat(),
+    }
+
+
+@click.command("rebuild-score-stats")
+@click.option("--batch-size", default=1000, show_default=True, help="Rows fetched and inserted per batch.")
+@with_appcontext
+def rebuild_command(batch_size):
+    """Recompute the per-user score summaries and band histogram from speaking_tests."""
+    start = time.perf_counter()
+    users, scored = rebuild(batch_size)
+    click.echo(f"Rebuilt score stats: {users} users, {scored} scored tests in {time.perf_counter() - start:.1f}s")
+
+
+def init_app(app):
+    app.cli.add_command(rebuild_command)
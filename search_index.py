@@ -0,0 +1,132 @@
+import re
+import math
+import heapq
+import threading
+from collections import defaultdict
+from sqlalchemy import select, func
+from sqlalchemy.dialects.mysql import match
+from models import db, GeneratedQuestion, LISTED_QUESTIONS
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(value):
+    return [t for t in TOKEN_RE.findall(value.casefold()) if len(t) > 1]
+
+
+class InvertedIndex:
+    """
+    In-process BM25 index over GeneratedQuestion topic + question text.
+
+    Used where MySQL FULLTEXT is unavailable (SQLite, tests). Rows are only
+    ever inserted, so the index stays current by pulling rows with an id above
+    the highest one already indexed before each search; new questions from
+    generate-question (or any other writer, in any worker) are picked up
+    incrementally without a rebuild. Question pool stock is not listed until it
+    is served, so unserved ids are remembered and indexed once they flip.
+    """
+
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.postings = defaultdict(dict)  # term -> {question id: term frequency}
+        self.doc_lengths = {}
+        self.total_length = 0
+        self.max_id = 0
+        self.unserved = set()
+        self._lock = threading.Lock()
+
+    def add(self, doc_id, value):
+        terms = tokenize(value)
+        for term in terms:
+            docs = self.postings[term]
+            docs[doc_id] = docs.get(doc_id, 0) + 1
+        self.doc_lengths[doc_id] = len(terms)
+        self.total_length += len(terms)
+        self.max_id = max(self.max_id, doc_id)
+
+    def catch_up(self):
+        """Index rows inserted since the last call, and pool rows served since."""
+        columns = select(GeneratedQuestion.id, GeneratedQuestion.topic, GeneratedQuestion.question)
+        if self.unserved:
+            # Bounded by the pool's stock, so one IN query
+            for row in db.session.execute(columns.where(GeneratedQuestion.id.in_(self.unserved), LISTED_QUESTIONS)):
+                self.unserved.discard(row.id)
+                self.add(row.id, f"{row.topic} {row.question}")
+        rows = db.session.execute(
+            columns.add_columns(GeneratedQuestion.served)
+            .where(GeneratedQuestion.id > self.max_id)
+            .order_by(GeneratedQuestion.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+        for row in rows:
+            if row.served:
+                self.add(row.id, f"{row.topic} {row.question}")
+            else:
+                self.unserved.add(row.id)
+                self.max_id = max(self.max_id, row.id)
+
+    def search(self, query, offset, limit):
+        """Return `(total, [(id, score), ...])` for one page of BM25-ranked matches."""
+        with self._lock:
+            self.catch_up()
+            n_docs = len(self.doc_lengths)
+            if not n_docs:
+                return 0, []
+            avg_length = self.total_length / n_docs
+
+            scores = defaultdict(float)
+            for term in set(tokenize(query)):
+                docs = self.postings.get(term)
+                if not docs:
+                    continue
+                idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, tf in docs.items():
+                    norm = self.K1 * (1 - self.B + self.B * self.doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] += idf * tf * (self.K1 + 1) / (tf + norm)
+
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return len(scores), top[offset:]
+
+
+class QuestionSearch:
+    """Full-text search over generated questions: MySQL FULLTEXT, else the in-process index."""
+
+    def __init__(self, app=None):
+        self.index = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.index = InvertedIndex(app.config["EXPORT_BATCH_SIZE"])
+        app.extensions["question_search"] = self
+
+    def search(self, query, page, limit):
+        """Return `(total, [(GeneratedQuestion, score), ...])` for the requested page."""
+        offset = (page - 1) * limit
+        if db.engine.dialect.name == "mysql":
+            return self._search_fulltext(query, offset, limit)
+
+        total, ranked = self.index.search(query, offset, limit)
+        if not ranked:
+            return total, []
+        rows = {q.id: q for q in GeneratedQuestion.query.filter(GeneratedQuestion.id.in_([i for i, _ in ranked]))}
+        return total, [(rows[i], score) for i, score in ranked if i in rows]
+
+    def _search_fulltext(self, query, offset, limit):
+        score = match(GeneratedQuestion.topic, GeneratedQuestion.question, against=query).in_natural_language_mode()
+        total = db.session.execute(
+            select(func.count()).select_from(GeneratedQuestion).where(score, LISTED_QUESTIONS)
+        ).scalar()
+        rows = db.session.execute(
+            select(GeneratedQuestion, score.label("score"))
+            .where(score, LISTED_QUESTIONS)
+            .order_by(score.desc(), GeneratedQuestion.id.desc())
+            .offset(offset)
+            .limit(limit)
+        ).all()
+        return total, [(row[0], row[1]) for row in rows]
+
+question_search = QuestionSearch()
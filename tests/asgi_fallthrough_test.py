@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import tempfile
+import subprocess
+import httpx
+
+# Bodyless responses from Flask routes served through `hypercorn asgi:app`: a conditional
+# GET answered 304 and a HEAD request must reach the client instead of failing in
+# hypercorn's WSGI adapter (which only starts a response with its first body chunk).
+#   python tests/asgi_fallthrough_test.py
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(tempfile.gettempdir(), "ielts_asgi_fallthrough.db")
+PORT = 5210
+BASE_URL = f"http://127.0.0.1:{PORT}"
+FLASK_ROUTE = "/api/questions/get-questions-sync"  # not one of asgi.py's native routes
+NATIVE_ROUTE = "/api/questions/get-questions-async"
+
+ENV = dict(os.environ, DATABASE_URI=f"sqlite:///{DB_PATH}", PYTHONPATH=ROOT, LLM_PROVIDER="stub",
+           JWT_SECRET_KEY=os.getenv("JWT_SECRET_KEY", "asgi-test-secret-key-with-at-least-32-bytes"))
+
+
+def seed():
+    script = """
+from app import create_app
+from models import db, GeneratedQuestion
+app = create_app()
+with app.app_context():
+    db.drop_all()
+    db.create_all()
+    db.session.add_all([GeneratedQuestion(topic="Travel", question=f"Describe trip {i}.") for i in range(3)])
+    db.session.commit()
+"""
+    subprocess.run([sys.executable, "-c", script], env=ENV, cwd=tempfile.gettempdir(), check=True)
+
+
+def wait_until_up():
+    for _ in range(100):
+        try:
+            httpx.get(f"{BASE_URL}/api/speaking_tests/testid/1", timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on port {PORT} did not start")
+
+
+def check(label, ok, detail):
+    print(f"{label}: {detail} -> {'PASS' if ok else 'FAIL'}")
+    return ok
+
+
+def main():
+    seed()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "hypercorn", "asgi:app", "-b", f"127.0.0.1:{PORT}", "--workers", "1"],
+        env=ENV, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    results = []
+    try:
+        wait_until_up()
+        with httpx.Client(base_url=BASE_URL, timeout=10.0) as client:
+            for route in (FLASK_ROUTE, NATIVE_ROUTE):
+                first = client.get(route)
+                etag = first.headers.get("etag")
+                results.append(check(f"GET {route}", first.status_code == 200 and etag is not None,
+                                     f"status={first.status_code} etag={etag}"))
+                again = client.get(route, headers={"If-None-Match": etag or '"none"'})
+                results.append(check(f"GET {route} If-None-Match", again.status_code == 304 and not again.content,
+                                     f"status={again.status_code} body={len(again.content)}B etag={again.headers.get('etag')}"))
+
+            head = client.head(FLASK_ROUTE)
+            results.append(check(f"HEAD {FLASK_ROUTE}", head.status_code == 200 and not head.content,
+                                 f"status={head.status_code} content-length={head.headers.get('content-length')}"))
+    finally:
+        server.terminate()
+        server.wait()
+    if not all(results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import asyncio
+import httpx
+import time
+import uuid
+
+# Your local API endpoint. Start the server with the rate limiter off, or the default
+# auth.register=5/60 bucket answers most of each round with 429:
+#   RATE_LIMIT_BACKEND=none python app.py
+API_URL = "http://127.0.0.1:5000/api/auth/register"
+
+# Parallel registrations per round, all for the same email (round 1) or the same phone (round 2)
+NUM_REQUESTS = 10
+
+# Fresh identity per run so the script can be re-run against the same database
+suffix = uuid.uuid4().hex[:8]
+
+
+async def send_register(client, payload, i):
+    try:
+        response = await client.post(API_URL, json=payload, timeout=30.0)
+        print(f"[{i}] Status: {response.status_code} | {response.json()}")
+        return response.status_code
+    except Exception as e:
+        print(f"[{i}] Error: {str(e)}")
+        return None
+
+
+async def race(client, label, payloads):
+    print(f"\n--- {label}: {len(payloads)} concurrent registrations ---")
+    statuses = await asyncio.gather(*[send_register(client, p, i + 1) for i, p in enumerate(payloads)])
+    created = statuses.count(201)
+    conflicts = statuses.count(409)
+    # Rate limited or hashing pool saturated: those requests never reached the duplicate check
+    throttled = statuses.count(429)
+    other = len(payloads) - created - conflicts - throttled
+    if created > 1 or other:
+        result = "FAIL"
+    elif throttled:
+        result = "INCONCLUSIVE"  # too few requests raced; rerun with RATE_LIMIT_BACKEND=none
+    else:
+        result = "PASS" if created == 1 else "FAIL"
+    print(f"{label}: created={created} conflicts={conflicts} throttled={throttled} other={other} -> {result}")
+    return result
+
+
+async def main():
+    start = time.time()
+    same_email = [
+        {"name": f"Racer {i}", "email": f"race-{suffix}@example.com", "phone": f"+91{suffix}{i:03}",
+         "password": "StrongPass@123", "role": "test_taker"}
+        for i in range(NUM_REQUESTS)
+    ]
+    same_phone = [
+        {"name": f"Racer {i}", "email": f"race-{suffix}-{i}@example.com", "phone": f"+44{suffix}",
+         "password": "StrongPass@123", "role": "test_taker"}
+        for i in range(NUM_REQUESTS)
+    ]
+    async with httpx.AsyncClient() as client:
+        results = [
+            await race(client, "Duplicate email", same_email),
+            await race(client, "Duplicate phone", same_phone),
+        ]
+    print(f"\nAll requests completed in {time.time() - start:.2f} seconds")
+    if "FAIL" in results:
+        raise SystemExit(1)
+    if "INCONCLUSIVE" in results:
+        raise SystemExit(2)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import subprocess
+import httpx
+
+# Throughput of the read endpoints under the Flask app (sync SQLAlchemy, asyncio.to_thread)
+# vs the native ASGI mode in asgi.py (async engine on a shared event loop).
+# Both servers run under hypercorn with one worker against the same seeded SQLite file.
+#   python tests/bench_asgi.py [concurrency ...]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(tempfile.gettempdir(), "ielts_bench_asgi.db")
+NUM_QUESTIONS = 5_000
+DURATION = 10  # seconds per run
+CONCURRENCY = [int(c) for c in sys.argv[1:]] or [100, 200]
+
+SERVERS = {
+    "flask (app)": ("app:create_app()", 5101),
+    "asgi (asgi)": ("asgi:app", 5102),
+}
+PATHS = [
+    "/api/questions/get-question-pages?page=5&limit=20",
+    "/api/questions/get-question-pages?after=&limit=20",
+    "/api/speaking_tests/testid/1",
+]
+
+ENV = dict(os.environ, DATABASE_URI=f"sqlite:///{DB_PATH}", PYTHONPATH=ROOT, LLM_PROVIDER="stub",
+           LOG_SAMPLE_RATES="questions=0,speaking_tests=0")
+
+
+def seed():
+    script = f"""
+from datetime import datetime
+from sqlalchemy import insert
+from app import create_app
+from models import db, User, SpeakingTest, GeneratedQuestion
+app = create_app()
+with app.app_context():
+    db.drop_all()
+    db.create_all()
+    db.session.add(User(name="Bench", email="bench@example.com", phone="0000000", password="x", role="admin"))
+    db.session.flush()
+    db.session.add(SpeakingTest(user_id=1, test_date=datetime(2025, 6, 1), status="scheduled"))
+    db.session.execute(insert(GeneratedQuestion), [
+        {{"topic": f"Topic {{i % 40}}", "question": f"Describe question number {{i}}."}} for i in range({NUM_QUESTIONS})
+    ])
+    db.session.commit()
+"""
+    subprocess.run([sys.executable, "-c", script], env=ENV, cwd=tempfile.gettempdir(), check=True)
+
+
+async def client_loop(client, base_url, deadline, latencies, errors, i):
+    n = 0
+    while time.perf_counter() < deadline:
+        path = PATHS[(i + n) % len(PATHS)]
+        n += 1
+        start = time.perf_counter()
+        try:
+            response = await client.get(base_url + path)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except Exception as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(base_url, concurrency):
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        deadline = time.perf_counter() + DURATION
+        await asyncio.gather(*[client_loop(client, base_url, deadline, latencies, errors, i) for i in range(concurrency)])
+    latencies.sort()
+    pct = lambda p: latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000 if latencies else float("nan")
+    return len(latencies) / DURATION, pct(0.5), pct(0.99), len(errors)
+
+
+def wait_until_up(port):
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/speaking_tests/testid/1", timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def main():
+    seed()
+    print(f"{'server':<18}{'clients':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, (target, port) in SERVERS.items():
+        server = subprocess.Popen(
+            [sys.executable, "-m", "hypercorn", target, "-b", f"127.0.0.1:{port}", "--workers", "1"],
+            env=ENV, cwd=tempfile.gettempdir(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_until_up(port)
+            for concurrency in CONCURRENCY:
+                rps, p50, p99, errors = asyncio.run(run(f"http://127.0.0.1:{port}", concurrency))
+                print(f"{name:<18}{concurrency:>8}{rps:>10.1f}{p50:>10.1f}{p99:>10.1f}{errors:>8}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
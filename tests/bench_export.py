@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+import subprocess
+
+# Compares the materializing list endpoint with the streaming export on a seeded SQLite table.
+# Seeding and each case run in a fresh interpreter so peak RSS is not polluted by the previous one.
+#   python tests/bench_export.py [num_rows]
+
+NUM_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 200_000
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(tempfile.gettempdir(), "ielts_bench_export.db")
+sys.path.insert(0, ROOT)
+
+CASES = {
+    "get-questions-sync": "/api/questions/get-questions-sync",
+    "export-ndjson": "/api/questions/export?format=ndjson",
+    "export-json": "/api/questions/export?format=json",
+}
+
+
+def make_app():
+    os.environ["DATABASE_URI"] = f"sqlite:///{DB_PATH}"
+    os.environ["LLM_PROVIDER"] = "stub"
+    from app import create_app
+    return create_app()
+
+
+def seed():
+    from models import db, GeneratedQuestion
+    from sqlalchemy import insert
+
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        rows = [
+            {"topic": f"Topic {i % 50}", "question": f"Describe a time when you learned something new about topic {i}. " * 3}
+            for i in range(NUM_ROWS)
+        ]
+        db.session.execute(insert(GeneratedQuestion), rows)
+        db.session.commit()
+    print(f"Seeded {NUM_ROWS} questions into {DB_PATH}")
+
+
+def run_case(name):
+    app = make_app()
+    client = app.test_client()
+
+    start = time.perf_counter()
+    response = client.get(CASES[name], buffered=False)
+    chunks = iter(response.response)
+    first = next(chunks)
+    ttfb = time.perf_counter() - start
+    size = len(first)
+    for chunk in chunks:
+        size += len(chunk)
+    total = time.perf_counter() - start
+    response.close()
+
+    # ru_maxrss is KiB on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"case": name, "ttfb_s": round(ttfb, 4), "total_s": round(total, 3),
+                      "bytes": size, "peak_rss_mb": round(peak_rss_mb, 1)}))
+
+
+def main():
+    # Seed in a child too: Linux carries the parent's peak RSS into forked children
+    subprocess.run([sys.executable, __file__, "--seed", str(NUM_ROWS)], check=True)
+    print(f"\n{'case':<22}{'TTFB (s)':>10}{'total (s)':>11}{'MB out':>9}{'peak RSS (MB)':>15}")
+    for name in CASES:
+        out = subprocess.run(
+            [sys.executable, __file__, "--case", name],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        print(f"{name:<22}{result['ttfb_s']:>10}{result['total_s']:>11}"
+              f"{result['bytes'] / 1e6:>9.1f}{result['peak_rss_mb']:>15}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--case":
+        run_case(sys.argv[2])
+    elif len(sys.argv) > 2 and sys.argv[1] == "--seed":
+        NUM_ROWS = int(sys.argv[2])
+        seed()
+    else:
+        main()
@@ -0,0 +1,91 @@
+import os
+import re
+import sys
+import json
+import tempfile
+import statistics
+import subprocess
+
+# Cold-start cost of the app: `import app` under `python -X importtime` (total and the
+# heaviest top-level packages), then create_app() and a CLI command end to end. Each
+# measurement runs in a fresh interpreter, several times, and the median is reported.
+#   python tests/bench_importtime.py [runs] [--json]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = int(next((a for a in sys.argv[1:] if a.isdigit()), 5))
+TOP = 12
+
+ENV = dict(os.environ, PYTHONPATH=ROOT, FLASK_APP="app", LLM_PROVIDER=os.getenv("LLM_PROVIDER", "azure"),
+           DATABASE_URI=f"sqlite:///{os.path.join(tempfile.gettempdir(), 'ielts_bench_importtime.db')}",
+           AZURE_OPENAI_API_KEY="bench", AZURE_OPENAI_ENDPOINT="https://bench.invalid")
+
+CREATE_APP = """
+import time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+print(imported - start, time.perf_counter() - imported)
+"""
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def importtime():
+    """Cumulative microseconds of `import app` and of each module it imports directly."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"], env=ENV, cwd=tempfile.gettempdir(),
+                            capture_output=True, text=True, check=True)
+    total, modules = 0, {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        depth = len(match.group(3))  # 1 space for `app` itself, 3 for what it imports, ...
+        if depth == 1 and match.group(4) == "app":
+            total = int(match.group(2))
+        elif depth == 3:
+            modules[match.group(4)] = int(match.group(2))
+    return total, modules
+
+
+def timed(args):
+    result = subprocess.run(args, env=ENV, cwd=tempfile.gettempdir(), capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def main():
+    samples = [importtime() for _ in range(RUNS)]
+    totals = [total / 1e6 for total, _ in samples]
+    modules = {name: statistics.median(m.get(name, 0) for _, m in samples) / 1e6 for name in samples[0][1]}
+
+    import_s, create_s = zip(*(map(float, timed([sys.executable, "-c", CREATE_APP]).split()) for _ in range(RUNS)))
+
+    def cli_seconds():
+        out = timed([sys.executable, "-c", "import time, subprocess, sys; s = time.perf_counter(); "
+                     "subprocess.run([sys.executable, '-m', 'flask', 'routes'], check=True, capture_output=True); "
+                     "print(time.perf_counter() - s)"])
+        return float(out)
+    cli = [cli_seconds() for _ in range(RUNS)]
+
+    report = {
+        "runs": RUNS,
+        "import_app_s": round(statistics.median(totals), 3),
+        "import_wall_s": round(statistics.median(import_s), 3),
+        "create_app_s": round(statistics.median(create_s), 3),
+        "flask_routes_s": round(statistics.median(cli), 3),
+        "heaviest_imports_s": {name: round(t, 3) for name, t in sorted(modules.items(), key=lambda kv: -kv[1])[:TOP]},
+    }
+    if "--json" in sys.argv:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"import app (importtime)  {report['import_app_s']:.3f}s")
+    print(f"import app (wall)        {report['import_wall_s']:.3f}s")
+    print(f"create_app()             {report['create_app_s']:.3f}s")
+    print(f"flask routes             {report['flask_routes_s']:.3f}s")
+    print("heaviest top-level imports:")
+    for name, t in report["heaviest_imports_s"].items():
+        print(f"  {name:<28}{t:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
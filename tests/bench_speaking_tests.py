@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+
+# GET /api/speaking_tests/list on a seeded SQLite table, with and without the
+# (user_id, test_date) and (status, test_date) indexes. The table is reused between runs
+# when it already has the requested size.
+#   python tests/bench_speaking_tests.py [num_rows]
+
+NUM_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 1_000_000
+NUM_USERS = 10_000
+REPEAT = 20
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(tempfile.gettempdir(), "ielts_bench_speaking_tests.db")
+sys.path.insert(0, ROOT)
+os.environ["DATABASE_URI"] = f"sqlite:///{DB_PATH}"
+os.environ["LLM_PROVIDER"] = "stub"
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret-key-with-at-least-32-bytes")
+os.environ.setdefault("LOG_SAMPLE_RATES", "speaking_tests=0")
+
+from sqlalchemy import insert, text, func
+from app import create_app
+from models import db, User, SpeakingTest
+from routes.auth import generate_jwt
+
+INDEXES = {
+    "ix_speaking_tests_user_id_test_date": "speaking_tests (user_id, test_date)",
+    "ix_speaking_tests_status_test_date": "speaking_tests (status, test_date)",
+}
+START = datetime(2024, 1, 1)
+
+CASES = {
+    "tests for one user": lambda: {"user_id": random.randint(1, NUM_USERS)},
+    "scheduled in a week": lambda: {"status": "scheduled", "date_from": (d := START + timedelta(days=random.randint(0, 700))).isoformat(),
+                                    "date_to": (d + timedelta(days=7)).isoformat()},
+    "unscored completed": lambda: {"status": "completed", "scored": "false"},
+    "user, 5th page": None,  # follows next_cursor from the first page
+}
+
+
+def seed(app):
+    with app.app_context():
+        db.create_all()
+        if db.session.scalar(func.count(SpeakingTest.id)) == NUM_ROWS:
+            return
+        db.drop_all()
+        db.create_all()
+        db.session.execute(insert(User), [
+            {"name": f"User {i}", "email": f"user{i}@bench.example", "phone": str(5550000000 + i), "password": "x", "role": "test_taker"}
+            for i in range(NUM_USERS)
+        ])
+        rng = random.Random(0)
+        statuses = ["scheduled", "completed", "cancelled"]
+        for start in range(0, NUM_ROWS, 100_000):
+            rows = []
+            for _ in range(min(100_000, NUM_ROWS - start)):
+                status = rng.choice(statuses)
+                rows.append({
+                    "user_id": rng.randint(1, NUM_USERS),
+                    "test_date": START + timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60)),
+                    "status": status,
+                    "score": round(rng.uniform(4, 9) * 2) / 2 if status == "completed" and rng.random() < 0.9 else None,
+                })
+            db.session.execute(insert(SpeakingTest), rows)
+        db.session.commit()
+        db.session.execute(text("ANALYZE"))
+    print(f"Seeded {NUM_ROWS} speaking tests into {DB_PATH}")
+
+
+def set_indexes(app, enabled):
+    with app.app_context():
+        for name, target in INDEXES.items():
+            db.session.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {target}" if enabled else f"DROP INDEX IF EXISTS {name}"))
+        db.session.commit()
+        db.session.execute(text("ANALYZE"))
+
+
+def run(client, headers):
+    results = {}
+    for name, make_params in CASES.items():
+        random.seed(1)
+        timings = []
+        for _ in range(REPEAT):
+            if make_params is None:
+                params = {"user_id": random.randint(1, NUM_USERS), "limit": 5}
+                for _ in range(4):
+                    params["after"] = client.get("/api/speaking_tests/list", query_string=params, headers=headers).json["next_cursor"] or ""
+            else:
+                params = make_params()
+            start = time.perf_counter()
+            response = client.get("/api/speaking_tests/list", query_string=params, headers=headers)
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.json
+        results[name] = statistics.median(timings) * 1000
+    return results
+
+
+def main():
+    app = create_app()
+    seed(app)
+    with app.app_context():
+        headers = {"Authorization": f"Bearer {generate_jwt(1, 'admin')}"}
+    client = app.test_client()
+
+    set_indexes(app, False)
+    without = run(client, headers)
+    set_indexes(app, True)
+    with_indexes = run(client, headers)
+
+    print(f"\n{NUM_ROWS} rows, median of {REPEAT} requests")
+    print(f"{'case':<24}{'no index (ms)':>15}{'indexed (ms)':>14}{'speedup':>10}")
+    for name in CASES:
+        print(f"{name:<24}{without[name]:>15.1f}{with_indexes[name]:>14.1f}{without[name] / with_indexes[name]:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import tempfile
+
+# Micro-benchmark: jwt.decode on every request vs the verified-token cache in middleware.py.
+#   python tests/bench_token_cache.py
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret-key-with-at-least-32-bytes")
+os.environ["DATABASE_URI"] = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'ielts_bench_token.db')}"
+os.environ["LLM_PROVIDER"] = "stub"
+
+import jwt
+from config import Config
+from app import create_app
+from models import db, User
+from middleware import TokenCache
+from routes.auth import generate_jwt
+
+NUM_CALLS = 20_000
+NUM_REQUESTS = 2_000
+
+# Admin endpoints timed through the full Flask stack
+ENDPOINTS = ["/api/users/getuserid/1", "/api/questions/pool-stats"]
+
+
+def time_calls(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6  # microseconds per call
+
+
+def micro(token, secret):
+    cache = TokenCache()
+    cache.put(token, jwt.decode(token, secret, algorithms=["HS256"]))
+
+    decode_us = time_calls(lambda: jwt.decode(token, secret, algorithms=["HS256"]), NUM_CALLS)
+    cached_us = time_calls(lambda: cache.get(token), NUM_CALLS)
+    print(f"{'jwt.decode':<28}{decode_us:>10.2f} us/call")
+    print(f"{'TokenCache.get':<28}{cached_us:>10.2f} us/call  ({decode_us / cached_us:.1f}x faster)")
+
+
+def endpoints():
+    NoCacheConfig = type("NoCacheConfig", (Config,), {"TOKEN_CACHE_SIZE": 0})
+    results = {}
+    for label, config in (("decode per request", NoCacheConfig), ("cached", Config)):
+        app = create_app(config)
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            db.session.add(User(name="Admin", email="admin@example.com", phone="9999999999",
+                                password="x", role="admin"))
+            db.session.commit()
+            token = generate_jwt(1, "admin")
+        client = app.test_client()
+        headers = {"Authorization": f"Bearer {token}"}
+        for path in ENDPOINTS:
+            results[(label, path)] = time_calls(lambda: client.get(path, headers=headers), NUM_REQUESTS)
+
+    print(f"\n{'endpoint':<32}{'decode (us)':>13}{'cached (us)':>13}")
+    for path in ENDPOINTS:
+        print(f"{path:<32}{results[('decode per request', path)]:>13.1f}{results[('cached', path)]:>13.1f}")
+
+
+if __name__ == "__main__":
+    app = create_app()
+    with app.app_context():
+        token = generate_jwt(1, "admin")
+    micro(token, app.config["JWT_SECRET_KEY"])
+    endpoints()
@@ -0,0 +1,296 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import httpx
+
+# Load-test suite for the API. Seeds a throwaway SQLite database, starts the app under
+# hypercorn with the offline stub LLM provider (LLM_PROVIDER=stub), then runs each scenario at
+# every concurrency level of the ramp through one shared, pooled httpx client.
+#
+#   python tests/loadtest.py                                    # all scenarios, default ramp
+#   python tests/loadtest.py -s reads -s auth --ramp 10,50,100 --duration 15
+#   python tests/loadtest.py --out results.json                 # save a run...
+#   python tests/loadtest.py --baseline results.json            # ...and fail on regressions against it
+#   python tests/loadtest.py --url http://127.0.0.1:5000 --no-seed   # an already running, already seeded server
+#
+# Results are JSON: one entry per (scenario, concurrency) with throughput, error count,
+# status mix and latency percentiles in milliseconds.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.gettempdir()
+DB_PATH = os.path.join(WORKDIR, "ielts_loadtest.db")
+PORT = 5200
+
+NUM_USERS = 200
+NUM_QUESTIONS = 5_000
+NUM_TESTS = 1_000
+PASSWORD = "loadtest-password"
+ADMIN_EMAIL = "admin@loadtest.example"
+TOPICS = ["Technology and Innovation", "Urbanization", "Globalization", "Family and Relationships",
+          "Media and Advertising", "Climate Change", "Work-Life Balance", "History and Heritage"]
+
+SERVER_ENV = {
+    "DATABASE_URI": f"sqlite:///{DB_PATH}",
+    "JWT_SECRET_KEY": "loadtest-secret-key-0123456789abcdef",
+    "LLM_PROVIDER": "stub",
+    # every client shares one IP, so per-client rate limits would only measure the limiter
+    "RATE_LIMIT_BACKEND": os.getenv("RATE_LIMIT_BACKEND", "none"),
+    "LOG_SAMPLE_RATES": "auth=0,users=0,questions=0,speaking_tests=0",  # errors are still logged
+    "PYTHONPATH": ROOT,
+}
+
+
+# --------------------------
+# Seeded data
+# --------------------------
+def seed():
+    """Fresh schema plus users, questions and speaking tests. Every user shares one password hash."""
+    script = f"""
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from app import create_app
+from models import db, User, SpeakingTest, GeneratedQuestion
+random.seed(0)
+app = create_app()
+with app.app_context():
+    db.drop_all()
+    db.create_all()
+    hashed = generate_password_hash({PASSWORD!r}, method=app.config["PASSWORD_HASH_METHOD"])
+    db.session.execute(insert(User), [
+        {{"name": f"User {{i}}", "email": {ADMIN_EMAIL!r} if i == 0 else f"user{{i}}@loadtest.example",
+          "phone": f"{{5550000000 + i}}", "password": hashed, "role": "admin" if i == 0 else "test_taker"}}
+        for i in range({NUM_USERS})
+    ])
+    db.session.execute(insert(GeneratedQuestion), [
+        {{"topic": random.choice({TOPICS!r}), "question": f"Describe question number {{i}}."}} for i in range({NUM_QUESTIONS})
+    ])
+    start = datetime(2025, 1, 1)
+    db.session.execute(insert(SpeakingTest), [
+        {{"user_id": random.randint(1, {NUM_USERS}), "test_date": start + timedelta(hours=i),
+          "status": random.choice(["scheduled", "completed"])}} for i in range({NUM_TESTS})
+    ])
+    db.session.commit()
+"""
+    subprocess.run([sys.executable, "-c", script], env=dict(os.environ, **SERVER_ENV), cwd=WORKDIR, check=True)
+
+
+# --------------------------
+# Scenarios: each returns a coroutine function issuing one request
+# --------------------------
+def auth_scenario(client, admin_token):
+    async def request():
+        # login storm: every request pays a password hash verification
+        email = ADMIN_EMAIL if random.random() < 0.01 else f"user{random.randint(1, NUM_USERS - 1)}@loadtest.example"
+        return await client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+    return request
+
+
+def reads_scenario(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    cursors = [""]
+
+    async def request():
+        kind = random.random()
+        if kind < 0.35:
+            return await client.get("/api/questions/get-question-pages", params={"page": random.randint(1, 50), "limit": 20})
+        if kind < 0.6:
+            response = await client.get("/api/questions/get-question-pages", params={"after": random.choice(cursors), "limit": 20})
+            cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+            if cursor and len(cursors) < 100:
+                cursors.append(cursor)
+            return response
+        if kind < 0.85:
+            return await client.get(f"/api/speaking_tests/testid/{random.randint(1, NUM_TESTS)}")
+        return await client.get("/api/users/list", params={"page": random.randint(1, 20), "limit": 10}, headers=headers)
+    return request
+
+
+def generate_scenario(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    async def request():
+        if random.random() < 0.8:
+            return await client.post("/api/questions/generate-question", headers=headers,
+                                     json={"topic": random.choice(TOPICS), "fresh": True})
+        return await client.post("/api/questions/generate-questions", headers=headers,
+                                 json={"topics": random.sample(TOPICS, 3)})
+    return request
+
+
+SCENARIOS = {
+    "auth": auth_scenario,
+    "reads": reads_scenario,
+    "generate": generate_scenario,
+}
+
+
+# --------------------------
+# Runner
+# --------------------------
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(int(len(sorted_values) * p / 100), len(sorted_values) - 1)] * 1000, 2)
+
+
+async def run_level(request, concurrency, duration):
+    latencies, statuses, errors = [], {}, 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await request()
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] = statuses.get(type(e).__name__, 0) + 1
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "throughput": round(len(latencies) / elapsed, 1),
+        "errors": errors,
+        "statuses": dict(sorted(statuses.items())),
+        "latency_ms": {p: percentile(latencies, int(p[1:])) for p in ("p50", "p90", "p95", "p99")}
+                      | {"max": round(latencies[-1] * 1000, 2) if latencies else None},
+    }
+
+
+async def run_suite(base_url, scenarios, ramp, duration):
+    limits = httpx.Limits(max_connections=max(ramp), max_keepalive_connections=max(ramp))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        login = await client.post("/api/auth/login", json={"email": ADMIN_EMAIL, "password": PASSWORD})
+        login.raise_for_status()
+        admin_token = login.json()["token"]
+
+        results = []
+        for name in scenarios:
+            request = SCENARIOS[name](client, admin_token)
+            for concurrency in ramp:
+                result = {"scenario": name, **await run_level(request, concurrency, duration)}
+                print_result(result)
+                results.append(result)
+        return results
+
+
+def print_result(r):
+    lat = r["latency_ms"]
+    fmt = lambda v: f"{v:>9.1f}" if v is not None else f"{'-':>9}"
+    print(f"{r['scenario']:<10}{r['concurrency']:>6}{r['throughput']:>9.1f}{fmt(lat['p50'])}{fmt(lat['p95'])}"
+          f"{fmt(lat['p99'])}{r['errors']:>8}", flush=True)
+
+
+def compare(results, baseline, tolerance):
+    """Lines describing every (scenario, concurrency) whose p95 or throughput regressed beyond `tolerance`."""
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        old = previous.get((r["scenario"], r["concurrency"]))
+        if not old:
+            continue
+        key = f"{r['scenario']}@{r['concurrency']}"
+        new_p95, old_p95 = r["latency_ms"]["p95"], old["latency_ms"]["p95"]
+        if new_p95 and old_p95 and new_p95 > old_p95 * (1 + tolerance):
+            regressions.append(f"{key}: p95 {old_p95:.1f}ms -> {new_p95:.1f}ms")
+        if old["throughput"] and r["throughput"] < old["throughput"] * (1 - tolerance):
+            regressions.append(f"{key}: throughput {old['throughput']:.1f} -> {r['throughput']:.1f} req/s")
+        if r["errors"] > old["errors"] and r["errors"] > r["requests"] * 0.01:
+            regressions.append(f"{key}: errors {old['errors']} -> {r['errors']}")
+    return regressions
+
+
+def wait_until_up(base_url):
+    for _ in range(200):
+        try:
+            httpx.get(base_url + "/api/speaking_tests/testid/1", timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server at {base_url} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the IELTS API")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS), help="scenario to run (repeatable; default all)")
+    parser.add_argument("--ramp", default="10,50,100", help="comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per concurrency level")
+    parser.add_argument("--target", default="app:create_app()", help="hypercorn target to start (app:create_app() or asgi:app)")
+    parser.add_argument("--workers", type=int, default=1, help="hypercorn worker processes")
+    parser.add_argument("--url", help="benchmark this running server instead of starting one")
+    parser.add_argument("--no-seed", action="store_true", help="keep the existing database")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="mean seconds the stub LLM takes per call")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="share of stub LLM calls that fail")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for request mixes")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare against; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    scenarios = args.scenario or list(SCENARIOS)
+    ramp = [int(c) for c in args.ramp.split(",")]
+
+    server = None
+    base_url = args.url or f"http://127.0.0.1:{PORT}"
+    if not args.url:
+        if not args.no_seed:
+            seed()
+        env = dict(os.environ, **SERVER_ENV, LLM_STUB_LATENCY=str(args.llm_latency),
+                   LLM_STUB_ERROR_RATE=str(args.llm_error_rate), LLM_STUB_SEED=str(args.seed))
+        server = subprocess.Popen(
+            [sys.executable, "-m", "hypercorn", args.target, "-b", f"127.0.0.1:{PORT}", "--workers", str(args.workers)],
+            env=env, cwd=WORKDIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    try:
+        wait_until_up(base_url)
+        print(f"{'scenario':<10}{'conc':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        results = asyncio.run(run_suite(base_url, scenarios, ramp, args.duration))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "target": args.url or args.target,
+        "workers": args.workers,
+        "duration": args.duration,
+        "python": sys.version.split()[0],
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import io
+import re
+import csv
+import json
+import time
+import logging
+import click
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError
+from models import db, User
+from hashing import password_hasher
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = r"[^@]+@[^@]+\.[^@]+"
+ALLOWED_ROLES = {"admin", "test_taker"}
+FORMATS = {"csv", "ndjson"}
+
+
+def valid_email(email):
+    return bool(re.match(EMAIL_PATTERN, email))
+
+
+def valid_phone(phone):
+    return 7 <= len(phone) <= 20
+
+
+def format_for(name):
+    """Import format from a content type or file name ("text/csv", "users.ndjson", ...), or None."""
+    name = (name or "").lower()
+    if "csv" in name:
+        return "csv"
+    if "ndjson" in name or "jsonl" in name or "json-lines" in name:
+        return "ndjson"
+    return None
+
+
+def read_records(stream, fmt):
+    """
+    Yield (line number, record) from a binary stream, one line at a time, so the
+    upload is never held in memory. A record is a dict, or a string describing
+    why the line could not be parsed.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="" if fmt == "csv" else None)
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        missing = {"name", "email", "phone", "password"} - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"CSV header is missing: {', '.join(sorted(missing))}")
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_no, "Invalid JSON"
+            continue
+        yield line_no, record if isinstance(record, dict) else "Each line must be a JSON object"
+
+
+def validate(record):
+    """Normalized user fields, or an error message (the same rules as users.create and auth.register)."""
+    if isinstance(record, str):
+        return record
+    fields = {key: str(record.get(key) or "").strip() for key in ("name", "email", "phone", "password", "role")}
+    fields["role"] = fields["role"] or "test_taker"
+    if not all(fields[key] for key in ("name", "email", "phone", "password")):
+        return "name, email, phone, and password are required"
+    if not valid_email(fields["email"]):
+        return "Invalid email format"
+    if not valid_phone(fields["phone"]):
+        return "Phone number must be between 7 and 20 characters"
+    if fields["role"] not in ALLOWED_ROLES:
+        return f"Invalid role. Allowed roles are: {', '.join(sorted(ALLOWED_ROLES))}"
+    return fields
+
+
+class UserImport:
+    """
+    Streams records into the users table in chunks of `batch_size`.
+
+    Each chunk is validated, deduplicated against earlier rows of the file and
+    against existing users (one IN query each for emails and phones), hashed in
+    parallel with `hash_many`, then inserted with one executemany and committed,
+    so a failure only loses the chunk in flight. Rows that lose a race with
+    concurrent registrations are rejected as duplicates, not the whole chunk.
+    Only the emails and phones seen so far are kept in memory.
+    """
+
+    def __init__(self, batch_size=1000, hash_many=None, max_errors=100, progress=None):
+        self.batch_size = batch_size
+        self.hash_many = hash_many or password_hasher.hash_many
+        self.max_errors = max_errors
+        self.progress = progress
+        self.seen_emails = set()
+        self.seen_phones = set()
+        self.report = {"processed": 0, "created": 0, "duplicates": 0, "invalid": 0, "errors": []}
+        self.started = time.perf_counter()
+
+    def run(self, records):
+        chunk = []
+        for line_no, record in records:
+            chunk.append((line_no, record))
+            if len(chunk) >= self.batch_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+        self.report["errors"].sort(key=lambda error: error["line"])
+        self.report["seconds"] = round(time.perf_counter() - self.started, 3)
+        return self.report
+
+    def reject(self, line_no, kind, message):
+        self.report[kind] += 1
+        if len(self.report["errors"]) < self.max_errors:
+            self.report["errors"].append({"line": line_no, "error": message})
+
+    def import_chunk(self, chunk):
+        rows = []
+        for line_no, record in chunk:
+            fields = validate(record)
+            if isinstance(fields, str):
+                self.reject(line_no, "invalid", fields)
+                continue
+            # Compared casefolded: MySQL's unique indexes use a case-insensitive collation
+            email, phone = fields["email"].casefold(), fields["phone"].casefold()
+            if email in self.seen_emails or phone in self.seen_phones:
+                self.reject(line_no, "duplicates", "Duplicate email or phone earlier in the file")
+            else:
+                self.seen_emails.add(email)
+                self.seen_phones.add(phone)
+                rows.append((line_no, fields))
+
+        rows = self.drop_existing(rows)
+        if rows:
+            hashes = self.hash_many([fields["password"] for _, fields in rows])
+            values = {line_no: dict(fields, password=pwhash) for (line_no, fields), pwhash in zip(rows, hashes)}
+            try:
+                db.session.execute(insert(User), list(values.values()))
+                db.session.commit()
+            except IntegrityError:
+                # Someone registered one of these addresses since the lookup: check again and retry once
+                db.session.rollback()
+                values = {line_no: values[line_no] for line_no, _ in self.drop_existing(rows)}
+                try:
+                    if values:
+                        db.session.execute(insert(User), list(values.values()))
+                    db.session.commit()
+                except IntegrityError:
+                    # Still racing concurrent registrations: insert row by row and reject the losers
+                    db.session.rollback()
+                    values = self.insert_each(values)
+            self.report["created"] += len(values)
+
+        self.report["processed"] += len(chunk)
+        elapsed = time.perf_counter() - self.started
+        logger.info(f"USER IMPORT: progress | processed={self.report['processed']} | created={self.report['created']} | "
+                    f"duplicates={self.report['duplicates']} | invalid={self.report['invalid']} | elapsed={elapsed:.1f}s")
+        if self.progress:
+            self.progress(self.report, elapsed)
+
+    def insert_each(self, values):
+        """Insert {line number: row} one savepoint per row; return the rows that went in."""
+        created = {}
+        for line_no, value in values.items():
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(User), [value])
+                created[line_no] = value
+            except IntegrityError:
+                self.reject(line_no, "duplicates", "User with this email or phone number already exists")
+        db.session.commit()
+        return created
+
+    def drop_existing(self, rows):
+        """Reject rows whose email or phone already belongs to a user."""
+        if not rows:
+            return rows
+        emails = [fields["email"] for _, fields in rows]
+        phones = [fields["phone"] for _, fields in rows]
+        # The IN matches case-insensitively on MySQL, so casefold what comes back before comparing
+        taken = db.session.execute(select(User.email).where(User.email.in_(emails))).scalars()
+        taken_emails = {email.casefold() for email in taken}
+        taken = db.session.execute(select(User.phone).where(User.phone.in_(phones))).scalars()
+        taken_phones = {phone.casefold() for phone in taken}
+        kept = []
+        for line_no, fields in rows:
+            if fields["email"].casefold() in taken_emails:
+                self.reject(line_no, "duplicates", "User with this email already exists")
+            elif fields["phone"].casefold() in taken_phones:
+                self.reject(line_no, "duplicates", "User with this phone number already exists")
+            else:
+                kept.append((line_no, fields))
+        return kept
+
+
+@click.command("import-users")
+@click.argument("path")
+@click.option("--format", "fmt", type=click.Choice(sorted(FORMATS)), help="Defaults to the file extension.")
+@click.option("--batch-size", type=int, help="Rows per transaction (default IMPORT_BATCH_SIZE).")
+@click.option("--workers", type=int, help="Hashing processes (default: one per CPU).")
+@with_appcontext
+def import_users_command(path, fmt, batch_size, workers):
+    """Bulk-create users from a CSV (with a header row) or NDJSON file; PATH '-' reads stdin."""
+    fmt = fmt or format_for(path)
+    if fmt is None:
+        raise click.UsageError("Cannot tell the format from the file name; pass --format csv or --format ndjson")
+
+    def progress(report, elapsed):
+        click.echo(f"{report['processed']} rows: {report['created']} created, {report['duplicates']} duplicates, "
+                   f"{report['invalid']} invalid ({report['processed'] / elapsed:.0f} rows/s)", err=True)
+
+    # The CLI owns the machine: hash on a private pool with every core rather than the app's HASH_WORKERS
+    with ProcessPoolExecutor(max_workers=workers) as executor, click.open_file(path, "rb") as stream:
+        importer = UserImport(
+            batch_size=batch_size or current_app.config["IMPORT_BATCH_SIZE"],
+            hash_many=lambda passwords: password_hasher.hash_many(passwords, executor=executor),
+            max_errors=current_app.config["IMPORT_MAX_ERRORS"],
+            progress=progress,
+        )
+        try:
+            report = importer.run(read_records(stream, fmt))
+        except ValueError as e:
+            click.echo(json.dumps(importer.report, indent=2))
+            raise click.ClickException(str(e))
+    click.echo(json.dumps(report, indent=2))
+
+
+def init_app(app):
+    app.cli.add_command(import_users_command)